@@ -0,0 +1,100 @@
+"""
+Per-row CPU and memory of a 10k-row book list: ORM entities versus projected columns.
+
+The ORM variant is how the list endpoints used to load books (select(Book) with the review
+stats joined in, one SQLModel instance per row in the identity map); the projected variant
+is BookService.get_user_books. Both are rendered to JSON with the Book list TypeAdapter, so
+the numbers cover load + serialize, which is what the endpoints pay per page.
+
+Run from the repository root with the application's environment loaded:
+
+    python -m benchmarks.bench_list_projection
+"""
+import asyncio
+import time
+import tracemalloc
+import uuid
+from datetime import date
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, desc, insert, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.books.routes import book_list_adapter
+from src.books.service import BOOK_OPTIONS, BookService
+from src.db.models import Book, BookReviewStats, User
+
+ROWS = 10_000
+ROUNDS = 5
+
+
+async def _seed(sessionmaker, owner_uid: uuid.UUID) -> None:
+    async with sessionmaker() as session:
+        session.add(User(uid=owner_uid, username="bench", email="bench@example.com", password_hash="x",
+                         first_name="Bench", last_name="User", role="user", is_verified=True))
+        await session.flush()
+        books = [
+            {"uid": uuid.uuid4(), "title": f"Benchmark Book {i}", "author": "Bench Author", "publisher": "Bench Press",
+             "published_date": date(2020, 1, 1), "page_count": 100 + i % 900, "language": "English",
+             "user_uid": owner_uid}
+            for i in range(ROWS)
+        ]
+        await session.exec(insert(Book), params=books)
+        # Half of the books have review stats, so both shapes of review_stats are rendered.
+        await session.exec(insert(BookReviewStats), params=[
+            {"book_uid": book["uid"], "review_count": 2, "rating_sum": 7, "average_rating": 3.5,
+             "rating_histogram": {"3": 1, "4": 1}}
+            for book in books[::2]
+        ])
+        await session.commit()
+
+
+async def _orm_books(session: AsyncSession, owner_uid: uuid.UUID):
+    statement = select(Book).options(*BOOK_OPTIONS).where(Book.user_uid == owner_uid).order_by(desc(Book.created_at))
+    return (await session.exec(statement)).all()
+
+
+async def _projected_books(session: AsyncSession, owner_uid: uuid.UUID):
+    return await BookService().get_user_books(owner_uid, session)
+
+
+async def _measure(label: str, sessionmaker, load, owner_uid: uuid.UUID) -> None:
+    cpu = []
+    for _ in range(ROUNDS):
+        async with sessionmaker() as session:
+            start = time.process_time()
+            books = await load(session, owner_uid)
+            payload = book_list_adapter.dump_json(book_list_adapter.validate_python(books, from_attributes=True))
+            cpu.append(time.process_time() - start)
+            assert len(books) == ROWS and payload
+
+    async with sessionmaker() as session:
+        tracemalloc.start()
+        books = await load(session, owner_uid)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del books
+
+    best = min(cpu)
+    print(f"{label:<10} {best * 1000:9.1f} ms/page {best / ROWS * 1e6:8.2f} us/row "
+          f"{peak / 1024 / 1024:8.1f} MiB peak {peak / ROWS:8.0f} B/row")
+
+
+async def main() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    sessionmaker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    owner_uid = uuid.uuid4()
+    await _seed(sessionmaker, owner_uid)
+
+    print(f"{ROWS} books per page, best of {ROUNDS} rounds (load + render), peak memory of the load")
+    await _measure("orm", sessionmaker, _orm_books, owner_uid)
+    await _measure("projected", sessionmaker, _projected_books, owner_uid)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""
+Requests/s for the book list endpoints with and without FAST_JSON_RESPONSES.
+
+Drives the real application in-process (auth, routing, response rendering) against an
+in-memory SQLite catalogue, so the difference between the two runs is the response
+rendering path: FastAPI's response_model handling versus a single TypeAdapter
+validate + dump_json.
+
+Run from the repository root with the application's environment loaded:
+
+    python -m benchmarks.bench_list_responses
+"""
+import asyncio
+import time
+import uuid
+from datetime import date
+from unittest.mock import patch
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src import app
+from src.auth.utils import create_access_token
+from src.config import Config
+from src.db.main import get_read_session, get_session
+from src.db.models import Book, User
+
+BOOKS = 500
+PAGE_SIZE = 100
+REQUESTS = 200
+
+
+async def _not_blocked(jti: str) -> bool:
+    return False
+
+
+async def _seed(sessionmaker, owner_uid: uuid.UUID) -> None:
+    async with sessionmaker() as session:
+        session.add(User(uid=owner_uid, username="bench", email="bench@example.com", password_hash="x",
+                         first_name="Bench", last_name="User", role="user", is_verified=True))
+        session.add_all([
+            Book(title=f"Benchmark Book {i}", author="Bench Author", publisher="Bench Press",
+                 published_date=date(2020, 1, 1), page_count=100 + i, language="English", user_uid=owner_uid)
+            for i in range(BOOKS)
+        ])
+        await session.commit()
+
+
+async def _run(label: str, client: httpx.AsyncClient, url: str, headers: dict) -> float:
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+    rate = REQUESTS / (time.perf_counter() - start)
+    print(f"{label:<44} {rate:10.1f} req/s")
+    return rate
+
+
+async def main() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    sessionmaker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    owner_uid = uuid.uuid4()
+    await _seed(sessionmaker, owner_uid)
+
+    async def _session():
+        async with sessionmaker() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = _session
+    app.dependency_overrides[get_read_session] = _session
+
+    token = create_access_token({"email": "bench@example.com", "user_uid": str(owner_uid), "role": "user",
+                                 "is_verified": True})
+    headers = {"Authorization": f"Bearer {token}"}
+    endpoints = {
+        f"GET /books/?limit={PAGE_SIZE}": f"/api/v1/books/?limit={PAGE_SIZE}",
+        f"GET /books/user/{{uid}} ({BOOKS} books)": f"/api/v1/books/user/{owner_uid}",
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    with patch("src.db.redis.token_blocklist_client.token_in_blocklist", _not_blocked):
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            for label, url in endpoints.items():
+                results = {}
+                for fast in (False, True):
+                    Config.FAST_JSON_RESPONSES = fast
+                    await client.get(url, headers=headers)  # warm up
+                    results[fast] = await _run(f"{label} fast={fast}", client, url, headers)
+                print(f"{'':<44} {results[True] / results[False]:10.2f}x\n")
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
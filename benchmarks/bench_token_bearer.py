@@ -0,0 +1,65 @@
+"""
+Microbenchmark for bearer-token verification per request.
+
+A typical protected route depends on AccessTokenBearer directly and again through
+RoleChecker -> get_current_user, so each request runs two bearer dependencies.
+This compares the previous behaviour (each bearer decodes the token twice and
+checks the blocklist) with the request-scoped claims cache.
+
+Run from the repository root with the application's environment loaded:
+
+    python -m benchmarks.bench_token_bearer
+"""
+import asyncio
+import time
+from unittest.mock import patch
+
+from fastapi import Request
+
+from src.auth.dependencies import AccessTokenBearer
+from src.auth.utils import create_access_token, decode_token
+
+BEARERS_PER_REQUEST = 2
+REQUESTS = 20_000
+
+
+async def _not_blocked(jti: str) -> bool:
+    return False
+
+
+def _request(token: str) -> Request:
+    return Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+
+async def _previous_bearer(request: Request) -> dict:
+    token = request.headers["authorization"].split(" ", 1)[1]
+    token_data = decode_token(token)
+    if decode_token(token) is None:
+        raise ValueError("invalid token")
+    await _not_blocked(token_data["jti"])
+    return token_data
+
+
+async def _run(label: str, bearers, token: str) -> float:
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        request = _request(token)
+        for bearer in bearers:
+            await bearer(request)
+    per_request = (time.perf_counter() - start) / REQUESTS * 1e6
+    print(f"{label:<28} {per_request:8.2f} us/request")
+    return per_request
+
+
+async def main() -> None:
+    token = create_access_token({"email": "bench@example.com", "user_uid": "bench", "role": "user"})
+
+    with patch("src.db.redis.token_blocklist_client.token_in_blocklist", _not_blocked):
+        previous = await _run("decode per dependency", [_previous_bearer] * BEARERS_PER_REQUEST, token)
+        cached = await _run("decode once per request", [AccessTokenBearer()] * BEARERS_PER_REQUEST, token)
+
+    print(f"saving: {previous - cached:.2f} us/request ({previous / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -33,6 +33,23 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = SQLModel.metadata
 
+# Schema objects created by hand-written migrations with no counterpart in SQLModel.metadata.
+# Without this, autogenerate sees them only in the database and emits a drop for each.
+MIGRATION_ONLY_OBJECTS = {
+    ("column", "books", "search_vector"),
+    ("index", "books", "ix_books_search_vector"),
+    # pg_trgm GIN indexes; declaring them on the models would make create_all need the extension.
+    ("index", "books", "ix_books_title_trgm"),
+    ("index", "tags", "ix_tags_name_trgm"),
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if reflected and compare_to is None and type_ in ("column", "index"):
+        return (type_, object.table.name, name) not in MIGRATION_ONLY_OBJECTS
+
+    return True
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -58,6 +75,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -65,7 +83,7 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,36 @@
+"""add trigram indexes
+
+Revision ID: 2f8d4c6a9b71
+Revises: 9a6c3e5b2d18
+Create Date: 2026-10-18 13:55:48.402771
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f8d4c6a9b71'
+down_revision: Union[str, None] = '9a6c3e5b2d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Serve the typeahead's ILIKE '%...%' lookups without scanning the tables.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_books_title_trgm', 'books', ['title'], postgresql_using='gin',
+                        postgresql_ops={'title': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix_tags_name_trgm', 'tags', ['name'], postgresql_using='gin',
+                        postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tags_name_trgm', table_name='tags', postgresql_concurrently=True)
+        op.drop_index('ix_books_title_trgm', table_name='books', postgresql_concurrently=True)
@@ -0,0 +1,53 @@
+"""add book review stats
+
+Revision ID: 5d2b8e7f1a34
+Revises: c41f9a2d7e63
+Create Date: 2026-10-18 11:02:17.604512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b8e7f1a34'
+down_revision: Union[str, None] = 'c41f9a2d7e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('book_review_stats',
+    sa.Column('book_uid', sa.Uuid(), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('rating_sum', sa.Integer(), nullable=False),
+    sa.Column('average_rating', sa.Float(), nullable=True),
+    sa.Column('rating_histogram', sa.JSON(), nullable=False),
+    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['book_uid'], ['books.uid'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('book_uid')
+    )
+    op.create_index('ix_book_review_stats_ranking', 'book_review_stats',
+                    ['average_rating', 'review_count', 'book_uid'])
+
+    # Backfill from the existing reviews; from here on ReviewService keeps the rows up to date.
+    op.execute("""
+        INSERT INTO book_review_stats (book_uid, review_count, rating_sum, average_rating, rating_histogram, updated_at)
+        SELECT book_uid, SUM(n), SUM(rating * n), SUM(rating * n)::float / SUM(n),
+               json_object_agg(rating::text, n), now()
+        FROM (
+            SELECT book_uid, rating, COUNT(*) AS n
+            FROM reviews
+            WHERE book_uid IS NOT NULL
+            GROUP BY book_uid, rating
+        ) AS per_rating
+        GROUP BY book_uid
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_book_review_stats_ranking', table_name='book_review_stats')
+    op.drop_table('book_review_stats')
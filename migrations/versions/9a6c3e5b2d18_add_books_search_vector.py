@@ -0,0 +1,70 @@
+"""add books search vector
+
+Revision ID: 9a6c3e5b2d18
+Revises: 5d2b8e7f1a34
+Create Date: 2026-10-18 12:40:03.118920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a6c3e5b2d18'
+down_revision: Union[str, None] = '5d2b8e7f1a34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Maps Book.language (free text such as "English" or "EN") to a text search configuration.
+    # Declared IMMUTABLE so it can be used in the generated column below; keep the list of
+    # configurations in sync with SEARCH_CONFIGS in src/books/service.py.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION books_search_config(language varchar) RETURNS regconfig
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT CASE lower(trim(language))
+                WHEN 'english' THEN 'english'
+                WHEN 'en' THEN 'english'
+                WHEN 'spanish' THEN 'spanish'
+                WHEN 'es' THEN 'spanish'
+                WHEN 'french' THEN 'french'
+                WHEN 'fr' THEN 'french'
+                WHEN 'german' THEN 'german'
+                WHEN 'de' THEN 'german'
+                WHEN 'italian' THEN 'italian'
+                WHEN 'it' THEN 'italian'
+                WHEN 'portuguese' THEN 'portuguese'
+                WHEN 'pt' THEN 'portuguese'
+                WHEN 'russian' THEN 'russian'
+                WHEN 'ru' THEN 'russian'
+                WHEN 'dutch' THEN 'dutch'
+                WHEN 'nl' THEN 'dutch'
+                ELSE 'simple'
+            END::regconfig
+        $$
+    """)
+
+    # Adding a stored generated column rewrites the table; run this in a maintenance window
+    # on large catalogues.
+    op.execute("""
+        ALTER TABLE books ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector(books_search_config(language), coalesce(title, '')), 'A') ||
+            setweight(to_tsvector(books_search_config(language), coalesce(author, '')), 'B') ||
+            setweight(to_tsvector(books_search_config(language), coalesce(publisher, '')), 'C')
+        ) STORED
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_books_search_vector', 'books', ['search_vector'], postgresql_using='gin',
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_books_search_vector', table_name='books', postgresql_concurrently=True)
+    op.execute("ALTER TABLE books DROP COLUMN search_vector")
+    op.execute("DROP FUNCTION books_search_config(varchar)")
@@ -0,0 +1,101 @@
+"""add lookup indexes
+
+Revision ID: c41f9a2d7e63
+Revises: aef7785babd6
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f9a2d7e63'
+down_revision: Union[str, None] = 'aef7785babd6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_users_email', 'users', ['email'], True),
+    ('ix_tags_name', 'tags', ['name'], True),
+    ('ix_books_created_at_uid', 'books', ['created_at', 'uid'], False),
+    ('ix_books_user_uid_created_at', 'books', ['user_uid', 'created_at'], False),
+    ('ix_reviews_book_uid', 'reviews', ['book_uid'], False),
+    ('ix_reviews_user_uid', 'reviews', ['user_uid'], False),
+    ('ix_booktag_tag_id', 'booktag', ['tag_id'], False),
+]
+
+
+def _check_unique_emails() -> None:
+    """
+    users.email had no unique constraint, and concurrent signups can both pass the existence
+    check. Which account to keep is not ours to decide, so refuse to go on until they are merged.
+    """
+    duplicates = op.get_bind().execute(sa.text("""
+        SELECT email, COUNT(*) FROM users GROUP BY email HAVING COUNT(*) > 1 ORDER BY email
+    """)).all()
+    if duplicates:
+        listing = "\n".join(f"  {email} ({count} accounts)" for email, count in duplicates)
+        raise RuntimeError(
+            "Cannot create the unique index ix_users_email, these emails belong to more than one user:\n"
+            f"{listing}\nMerge or delete the extra accounts, then run the migration again."
+        )
+
+
+def _drop_invalid_index(name: str) -> None:
+    # A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind under the same name.
+    invalid = op.get_bind().execute(sa.text("""
+        SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid
+        WHERE pg_class.relname = :name AND NOT pg_index.indisvalid
+    """), {"name": name}).first()
+    if invalid:
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def upgrade() -> None:
+    _check_unique_emails()
+
+    # tags.name becomes unique: fold duplicate tags into the oldest one first.
+    op.execute("""
+        WITH canonical AS (
+            SELECT uid, FIRST_VALUE(uid) OVER (PARTITION BY name ORDER BY created_at, uid) AS keep_uid
+            FROM tags
+        )
+        INSERT INTO booktag (book_id, tag_id)
+        SELECT DISTINCT booktag.book_id, canonical.keep_uid
+        FROM booktag JOIN canonical ON canonical.uid = booktag.tag_id
+        WHERE canonical.uid <> canonical.keep_uid
+        ON CONFLICT DO NOTHING
+    """)
+    op.execute("""
+        WITH canonical AS (
+            SELECT uid, FIRST_VALUE(uid) OVER (PARTITION BY name ORDER BY created_at, uid) AS keep_uid
+            FROM tags
+        )
+        DELETE FROM booktag USING canonical
+        WHERE booktag.tag_id = canonical.uid AND canonical.uid <> canonical.keep_uid
+    """)
+    op.execute("""
+        DELETE FROM tags USING (
+            SELECT uid, FIRST_VALUE(uid) OVER (PARTITION BY name ORDER BY created_at, uid) AS keep_uid
+            FROM tags
+        ) AS canonical
+        WHERE tags.uid = canonical.uid AND canonical.uid <> canonical.keep_uid
+    """)
+
+    # Build the indexes without blocking writes on large tables. Each one is committed on its
+    # own, so a re-run after a failure skips those already built and rebuilds an invalid one.
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            _drop_invalid_index(name)
+            op.create_index(name, table, columns, unique=unique, if_not_exists=True,
+                            postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -3,22 +3,32 @@ from fastapi.responses import JSONResponse
 from src.books.routes import book_router
 from src.auth.routes import auth_router
 from src.reviews.routes import review_router
+from src.tags.routes import tags_router
+from src.metrics import metrics_router
 from contextlib import asynccontextmanager
-from src.db.main import init_db, async_engine
-from src.db.redis import token_blocklist_client
+from src.db.main import init_db, async_engine, replica_router
+from src.db.redis import token_blocklist_client, book_cache_client, tag_list_cache_client
+from src.auth.utils import password_hash_pool
 from .errors import register_all_errors
-from .middleware import register_middleware
+from .middleware import register_middleware, start_access_log, stop_access_log
 
 
 @asynccontextmanager
 async def life_span(app: FastAPI):
     print("server is starting...")
+    start_access_log()
     from src.db.models import Book  # noqa
     await init_db()
     await token_blocklist_client.connect()
     yield
     await token_blocklist_client.close()
+    await book_cache_client.close()
+    await tag_list_cache_client.close()
     await async_engine.dispose()
+    if replica_router is not None:
+        await replica_router.dispose()
+    password_hash_pool.shutdown()
+    stop_access_log()
     print("server has been stopped")
 
 
@@ -28,6 +38,7 @@ app = FastAPI(
     title="Or Hasson Books API",
     description="A REST API for a book review web service",
     version=version,
+    lifespan=life_span,
     docs_url=f"/api/{version}/docs",
     redoc_url=f"/api/{version}/redoc",
     contact={
@@ -51,3 +62,5 @@ async def internal_server_error(request, exc):
 app.include_router(book_router, prefix=f"/api/{version}/books", tags=['books'])
 app.include_router(auth_router, prefix=f"/api/{version}/auth", tags=['auth'])
 app.include_router(review_router, prefix=f"/api/{version}/reviews", tags=['reviews'])
+app.include_router(tags_router, prefix=f"/api/{version}/tags", tags=['tags'])
+app.include_router(metrics_router)
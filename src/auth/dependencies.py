@@ -3,13 +3,14 @@ from fastapi import Request, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.db.models import User
+from src.config import Config
+from .schemas import TokenPrincipal
 from .utils import decode_token
 from .service import UserService
 from src.db.redis import token_blocklist_client
 from src.db.main import get_session
 from src.errors import (InvalidToken, RefreshTokenRequired, AccessTokenRequired, InsufficientPermission,
-                        AccountNotVerified)
+                        AccountNotVerified, UserNotFound)
 
 user_service = UserService()
 
@@ -22,22 +23,35 @@ class TokenBearer(HTTPBearer):
     async def __call__(self, request: Request) -> HTTPAuthorizationCredentials | None:
         creds = await super().__call__(request)
         token = creds.credentials
-        token_data = decode_token(token)
-
-        if not self.token_valid(token):
-            raise InvalidToken()
-
-        if await token_blocklist_client.token_in_blocklist(token_data['jti']):
-            raise InvalidToken()
+        token_data = await self.verified_token_data(request, token)
 
         self.verify_token_data(token_data)
 
         return token_data
 
-    def token_valid(self, token: str) -> bool:
+    async def verified_token_data(self, request: Request, token: str) -> dict:
+        """
+        Decode the token and check the blocklist once per request. The verified claims are
+        kept on request.state, so every bearer dependency in the same request reuses them.
+        """
+        verified_tokens = getattr(request.state, "verified_tokens", None)
+        if not isinstance(verified_tokens, dict):
+            verified_tokens = {}
+            request.state.verified_tokens = verified_tokens
+
+        token_data = verified_tokens.get(token)
+        if token_data is not None:
+            return token_data
+
         token_data = decode_token(token)
+        if token_data is None:
+            raise InvalidToken()
+
+        if await token_blocklist_client.token_in_blocklist(token_data['jti']):
+            raise InvalidToken()
 
-        return token_data is not None
+        verified_tokens[token] = token_data
+        return token_data
 
     def verify_token_data(self, token_data: dict):
         raise NotImplementedError("Please Override this method in child classes")
@@ -64,11 +78,35 @@ async def get_current_user(
     return user
 
 
+async def get_current_principal(
+        token_details: dict = Depends(AccessTokenBearer()),
+        session: AsyncSession = Depends(get_session)) -> TokenPrincipal:
+    """
+    Resolve the caller's role and verification status. With AUTH_TRUST_TOKEN_CLAIMS the signed
+    claims are used as-is; tokens without them, or still marked unverified (the user may have
+    verified since logging in), fall back to a column-only lookup of the user.
+    """
+    user_data = token_details['user']
+    if Config.AUTH_TRUST_TOKEN_CLAIMS and user_data.get('is_verified') and 'role' in user_data:
+        return TokenPrincipal(
+            uid=user_data['user_uid'],
+            email=user_data['email'],
+            role=user_data['role'],
+            is_verified=user_data['is_verified'],
+        )
+
+    principal = await user_service.get_principal_by_email(user_data['email'], session)
+    if principal is None:
+        raise UserNotFound()
+
+    return principal
+
+
 class RoleChecker:
     def __init__(self, allowed_roles: List[str]) -> None:
         self.allowed_roles = allowed_roles
 
-    def __call__(self, current_user: User = Depends(get_current_user)) -> Any:
+    def __call__(self, current_user: TokenPrincipal = Depends(get_current_principal)) -> Any:
         if not current_user.is_verified:
             raise AccountNotVerified()
         if current_user.role in self.allowed_roles:
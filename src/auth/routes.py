@@ -8,8 +8,9 @@ from src.config import Config
 from src.celery_tasks import send_email_task
 from src.db.main import get_session
 from src.db.redis import token_blocklist_client
+from src.metrics import CELERY_ENQUEUE_SECONDS
 from src.errors import InvalidCredentials, InvalidToken, UserAlreadyExists, UserNotFound
-from .dependencies import AccessTokenBearer, RefreshTokenBearer, RoleChecker, get_current_user
+from .dependencies import AccessTokenBearer, RefreshTokenBearer, RoleChecker
 from .schemas import (
     EmailModel,
     PasswordResetConfirmModel,
@@ -18,13 +19,14 @@ from .schemas import (
     UserCreateModel,
     UserLoginModel,
 )
-from .service import UserService
+from .service import USER_BOOKS_OPTIONS, UserService
 from .utils import (
+    build_user_claims,
     create_access_token,
     create_url_safe_token,
     decode_url_safe_token,
-    generate_passwd_hash,
-    verify_password,
+    generate_passwd_hash_async,
+    verify_password_async,
 )
 
 auth_router = APIRouter()
@@ -42,7 +44,8 @@ async def send_mail(emails: EmailModel):
     subject = "Welcome to our app"
     html_content = "<h1>Welcome to the app</h1>"
 
-    send_email_task.delay(recipients, subject, html_content)
+    with CELERY_ENQUEUE_SECONDS.labels("send_email").time():
+        send_email_task.delay(recipients, subject, html_content)
     return {"message": "Email sent successfully."}
 
 
@@ -68,7 +71,8 @@ async def create_user_account(
     <p>Please click the <a href="{link}">link</a> below to verify your email</p>
     """
 
-    send_email_task.delay([email], subject, html)
+    with CELERY_ENQUEUE_SECONDS.labels("send_email").time():
+        send_email_task.delay([email], subject, html)
 
     return {
         "message": "Account Created! Check email to verify your account",
@@ -110,14 +114,8 @@ async def login_users(login_data: UserLoginModel, session: AsyncSession = Depend
     password = login_data.password
 
     user = await user_service.get_user_by_email(email, session)
-    if user and verify_password(password, user.password_hash):
-        access_token = create_access_token(
-            user_data={
-                "email": user.email,
-                "user_uid": str(user.uid),
-                "role": user.role,
-            }
-        )
+    if user and await verify_password_async(password, user.password_hash):
+        access_token = create_access_token(user_data=build_user_claims(user))
         refresh_token = create_access_token(
             user_data={
                 "email": user.email,
@@ -142,25 +140,38 @@ async def login_users(login_data: UserLoginModel, session: AsyncSession = Depend
 
 
 @auth_router.get("/refresh_token")
-async def get_refreshed_token(token_details: dict = Depends(RefreshTokenBearer())):
+async def get_refreshed_token(
+        token_details: dict = Depends(RefreshTokenBearer()),
+        session: AsyncSession = Depends(get_session),
+):
     """
-    Exchange a valid refresh token for a new access token.
+    Exchange a valid refresh token for a new access token carrying the user's current role.
     """
     expiry_dt = datetime.fromtimestamp(token_details["exp"], tz=timezone.utc)
     if expiry_dt <= datetime.now(timezone.utc):
         raise InvalidToken()
 
-    new_access_token = create_access_token(user_data=token_details["user"])
+    principal = await user_service.get_principal_by_email(token_details["user"]["email"], session)
+    if principal is None:
+        raise UserNotFound()
+
+    new_access_token = create_access_token(user_data=build_user_claims(principal))
     return JSONResponse(content={"access_token": new_access_token})
 
 
 @auth_router.get("/current-user", response_model=UserBooksModel)
 async def get_current_user_route(
-        user=Depends(get_current_user), _: bool = Depends(role_checker)
+        token_details: dict = Depends(AccessTokenBearer()),
+        session: AsyncSession = Depends(get_session),
+        _: bool = Depends(role_checker),
 ):
     """
     Return the currently logged-in user's data (including books, reviews).
     """
+    user = await user_service.get_user_by_email(token_details['user']['email'], session, options=USER_BOOKS_OPTIONS)
+    if user is None:
+        raise UserNotFound()
+
     return user
 
 
@@ -197,7 +208,8 @@ async def password_reset_request(email_data: PasswordResetRequestModel):
     <p>Please click the <a href="{link}">link</a> below to Reset Your Password</p>
     """
 
-    send_email_task.delay([email], subject, html_message)
+    with CELERY_ENQUEUE_SECONDS.labels("send_email").time():
+        send_email_task.delay([email], subject, html_message)
     return JSONResponse(
         content={"message": "Please check your email for instructions to reset your password"},
         status_code=status.HTTP_200_OK
@@ -237,7 +249,7 @@ async def reset_account_password(
     if not user:
         raise UserNotFound()
 
-    hashed_password = generate_passwd_hash(passwords.new_password)
+    hashed_password = await generate_passwd_hash_async(passwords.new_password)
     await user_service.update_user(user, {"password_hash": hashed_password}, session)
 
     return JSONResponse(
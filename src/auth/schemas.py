@@ -27,6 +27,14 @@ class UserModel(BaseModel):
     updated_at: datetime
 
 
+class TokenPrincipal(BaseModel):
+    """The authorization facts about a user, as carried in access token claims."""
+    uid: uuid.UUID
+    email: str
+    role: str
+    is_verified: bool
+
+
 class UserBooksModel(UserModel):
     books: List[Book]
     reviews: List[ReviewModel]
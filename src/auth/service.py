@@ -1,18 +1,30 @@
-from src.db.models import User
-from .schemas import UserCreateModel
-from .utils import generate_passwd_hash
+from sqlalchemy.orm import joinedload, selectinload
+from src.db.models import Book, User
+from .schemas import TokenPrincipal, UserCreateModel
+from .utils import generate_passwd_hash_async
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 
+# What UserBooksModel renders: the user's books (each with its review stats) and reviews.
+USER_BOOKS_OPTIONS = (selectinload(User.books).joinedload(Book.review_stats), selectinload(User.reviews))
+
 
 class UserService:
-    async def get_user_by_email(self, email: str, session: AsyncSession):
-        statement = select(User).where(User.email == email)
+    async def get_user_by_email(self, email: str, session: AsyncSession, options: tuple = ()):
+        statement = select(User).options(*options).where(User.email == email)
         result = await session.exec(statement)
         user = result.first()
 
         return user
 
+    async def get_principal_by_email(self, email: str, session: AsyncSession):
+        """Load only the columns needed for authorization, skipping the user's relationships."""
+        statement = select(User.uid, User.email, User.role, User.is_verified).where(User.email == email)
+        result = await session.exec(statement)
+        row = result.first()
+
+        return TokenPrincipal(**row._asdict()) if row is not None else None
+
     async def user_exists(self, email: str, session: AsyncSession):
         user = await self.get_user_by_email(email, session)
 
@@ -21,7 +33,7 @@ class UserService:
     async def create_user(self, user_data: UserCreateModel, session: AsyncSession):
         user_data_dict = user_data.model_dump()
         new_user = User(**user_data_dict)
-        new_user.password_hash = generate_passwd_hash(user_data_dict['password'])
+        new_user.password_hash = await generate_passwd_hash_async(user_data_dict['password'])
         new_user.role = "user"
 
         session.add(new_user)
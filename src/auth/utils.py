@@ -1,5 +1,7 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime, timezone
-from typing import Any
+from typing import Any, Callable
 from itsdangerous import URLSafeTimedSerializer  # noqa
 
 from passlib.context import CryptContext
@@ -7,11 +9,49 @@ import jwt
 import uuid
 import logging
 from src.config import Config
+from src.metrics import PASSWORD_HASH_IN_FLIGHT, PASSWORD_HASH_QUEUE_DEPTH
 
-passwd_context = CryptContext(schemes=["bcrypt"])
+passwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=Config.PASSWORD_HASH_ROUNDS)
 ACCESS_TOKEN_EXPIRY = 3600
 
 
+class PasswordHashPool:
+    """
+    A dedicated, size-limited thread pool for bcrypt work, so hashing never blocks the
+    event loop. bcrypt releases the GIL while hashing, so the threads run in parallel.
+    Queue depth and in-flight jobs are exported as Prometheus gauges.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="passwd-hash")
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        PASSWORD_HASH_QUEUE_DEPTH.inc()
+        future = self._executor.submit(self._work, func, args)
+        future.add_done_callback(self._discard_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _discard_if_cancelled(self, future) -> None:
+        # A job cancelled while still queued never reaches _work.
+        if future.cancelled():
+            PASSWORD_HASH_QUEUE_DEPTH.dec()
+
+    def _work(self, func: Callable, args: tuple) -> Any:
+        PASSWORD_HASH_QUEUE_DEPTH.dec()
+        PASSWORD_HASH_IN_FLIGHT.inc()
+        try:
+            return func(*args)
+        finally:
+            PASSWORD_HASH_IN_FLIGHT.dec()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hash_pool = PasswordHashPool(max_workers=Config.PASSWORD_HASH_WORKERS)
+
+
 def generate_passwd_hash(password: str) -> str:
     hashed_password = passwd_context.hash(password)
     return hashed_password
@@ -21,6 +61,16 @@ def verify_password(password: str, hashed_password: str) -> bool:
     return passwd_context.verify(password, hashed_password)
 
 
+async def generate_passwd_hash_async(password: str) -> str:
+    """generate_passwd_hash on the password hash pool, for use from async code."""
+    return await password_hash_pool.run(generate_passwd_hash, password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """verify_password on the password hash pool, for use from async code."""
+    return await password_hash_pool.run(verify_password, password, hashed_password)
+
+
 def create_access_token(user_data: dict, expiry: timedelta = None, refresh: bool = False) -> str:
     payload = {}
     payload['user'] = user_data
@@ -34,6 +84,19 @@ def create_access_token(user_data: dict, expiry: timedelta = None, refresh: bool
     return token
 
 
+def build_user_claims(user: Any) -> dict:
+    """
+    The `user` claims of an access token. role and is_verified let RoleChecker
+    authorize requests without loading the user from the database.
+    """
+    return {
+        "email": user.email,
+        "user_uid": str(user.uid),
+        "role": user.role,
+        "is_verified": user.is_verified,
+    }
+
+
 def decode_token(token: str) -> Any | None:
     try:
         token_data = jwt.decode(
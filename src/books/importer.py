@@ -0,0 +1,328 @@
+"""
+Bulk importer for book catalogues in CSV or NDJSON.
+
+The file is streamed in chunks; each chunk is validated against BookCreateModel, loaded
+with asyncpg's COPY into a temporary staging table and merged into books, tags and booktag
+in one transaction. Progress is checkpointed to a state file after every committed chunk,
+so an interrupted import resumes where it stopped.
+
+Book uids are derived from the source name and the row number, which makes replaying a
+chunk (e.g. a crash between the commit and the checkpoint) a no-op rather than a duplicate.
+
+    python -m src.books.importer catalogue.csv --owner <user uid>
+    python -m src.books.importer catalogue.ndjson --chunk-size 10000
+
+CSV files need a header row with the BookCreateModel fields. An optional "tags" column
+holds tag names separated by "|"; in NDJSON it may also be a list of names.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from pydantic import ValidationError, field_validator
+
+from src.db.redis import tag_list_cache_client
+from .schemas import BookCreateModel
+
+DEFAULT_CHUNK_SIZE = 5000
+TAG_SEPARATOR = "|"
+
+# Fixed namespace so the same source row always maps to the same book uid.
+IMPORT_NAMESPACE = uuid.UUID("5b0c1f7e-3f4a-4c1e-9a7d-2f6e8d1b4c90")
+
+STAGING_TABLE = "import_books"
+STAGING_COLUMNS = ["uid", "title", "author", "publisher", "published_date", "page_count", "language", "tags"]
+
+CREATE_STAGING_TABLE = f"""
+CREATE TEMPORARY TABLE IF NOT EXISTS {STAGING_TABLE} (
+    uid uuid PRIMARY KEY,
+    title varchar NOT NULL,
+    author varchar NOT NULL,
+    publisher varchar NOT NULL,
+    published_date date NOT NULL,
+    page_count integer NOT NULL,
+    language varchar NOT NULL,
+    tags text[] NOT NULL
+) ON COMMIT DELETE ROWS
+"""
+
+MERGE_BOOKS = f"""
+INSERT INTO books (uid, title, author, publisher, published_date, page_count, language,
+                   user_uid, created_at, updated_at)
+SELECT uid, title, author, publisher, published_date, page_count, language, $1, now(), now()
+FROM {STAGING_TABLE}
+ON CONFLICT (uid) DO NOTHING
+"""
+
+MERGE_TAGS = f"""
+INSERT INTO tags (uid, name, created_at)
+SELECT gen_random_uuid(), name, now()
+FROM (SELECT DISTINCT unnest(tags) AS name FROM {STAGING_TABLE}) AS names
+ON CONFLICT (name) DO NOTHING
+"""
+
+MERGE_BOOK_TAGS = f"""
+INSERT INTO booktag (book_id, tag_id)
+SELECT staged.uid, tags.uid
+FROM {STAGING_TABLE} AS staged
+CROSS JOIN LATERAL unnest(staged.tags) AS names(name)
+JOIN tags ON tags.name = names.name
+ON CONFLICT DO NOTHING
+"""
+
+
+class BookImportModel(BookCreateModel):
+    tags: list[str] = []
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def split_tags(cls, value: Any) -> Any:
+        if value is None:
+            return []
+        if isinstance(value, str):
+            value = value.split(TAG_SEPARATOR)
+        if isinstance(value, list):
+            # Drop blanks and duplicates, keeping the first occurrence's position.
+            return list(dict.fromkeys(name.strip() for name in value if isinstance(name, str) and name.strip()))
+
+        return value
+
+
+@dataclass
+class ImportState:
+    """
+    Checkpoint of an import: how many data rows of which file have been committed.
+    """
+    path: str
+    size: int
+    rows_done: int = 0
+
+    @classmethod
+    def load(cls, state_file: Path, source: Path) -> "ImportState":
+        """
+        Resume from state_file if it belongs to this exact file, otherwise start over.
+        """
+        fresh = cls(path=str(source.resolve()), size=source.stat().st_size)
+        if not state_file.exists():
+            return fresh
+
+        saved = cls(**json.loads(state_file.read_text()))
+        if (saved.path, saved.size) != (fresh.path, fresh.size):
+            return fresh
+
+        return saved
+
+    def save(self, state_file: Path) -> None:
+        # Write-then-rename so a crash never leaves a truncated checkpoint behind.
+        tmp_file = state_file.with_name(state_file.name + ".tmp")
+        tmp_file.write_text(json.dumps(self.__dict__))
+        os.replace(tmp_file, state_file)
+
+
+@dataclass
+class ImportStats:
+    rows: int = 0
+    inserted: int = 0
+    invalid: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def detect_format(path: Path) -> str:
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".ndjson", ".jsonl"):
+        return "ndjson"
+
+    raise ValueError(f"cannot infer the format of {path}; pass --format csv or --format ndjson")
+
+
+def read_rows(path: Path, file_format: str) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Yield (row number, row) for every data row of the file, numbered from 1.
+    Blank NDJSON lines are skipped but still counted, so numbering is stable across runs;
+    malformed ones are yielded as None and rejected by validation like any other bad row.
+    """
+    with path.open(newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            yield from enumerate(csv.DictReader(f), start=1)
+            return
+
+        for row_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield row_number, json.loads(line)
+            except json.JSONDecodeError:
+                yield row_number, None
+
+
+def book_uid_for(source: str, row_number: int) -> uuid.UUID:
+    return uuid.uuid5(IMPORT_NAMESPACE, f"{source}:{row_number}")
+
+
+def build_records(source: str, rows: list[tuple[int, Any]]) -> tuple[list[tuple], list[tuple[int, list]]]:
+    """
+    Validate a chunk of rows, returning the COPY records for the valid ones
+    (in STAGING_COLUMNS order) and (row number, errors) for the invalid ones.
+    """
+    records = []
+    errors = []
+
+    for row_number, row in rows:
+        try:
+            book = BookImportModel.model_validate(row)
+        except ValidationError as e:
+            errors.append((row_number, e.errors(include_url=False, include_context=False, include_input=False)))
+            continue
+
+        records.append((
+            book_uid_for(source, row_number),
+            book.title,
+            book.author,
+            book.publisher,
+            book.published_date,
+            book.page_count,
+            book.language,
+            book.tags,
+        ))
+
+    return records, errors
+
+
+def chunked(rows: Iterator[tuple[int, dict[str, Any]]], size: int) -> Iterator[list[tuple[int, dict[str, Any]]]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _inserted_count(status: str) -> int:
+    # asyncpg returns the command tag, e.g. "INSERT 0 5000".
+    return int(status.rsplit(" ", 1)[-1])
+
+
+class BookImporter:
+    def __init__(self, path: Path, file_format: str, source: str, owner_uid: Optional[uuid.UUID],
+                 chunk_size: int, state_file: Path):
+        self.path = path
+        self.file_format = file_format
+        self.source = source
+        self.owner_uid = owner_uid
+        self.chunk_size = chunk_size
+        self.state_file = state_file
+
+    def pending_rows(self, state: ImportState) -> Iterator[tuple[int, dict[str, Any]]]:
+        """
+        The rows not yet committed according to the checkpoint.
+        """
+        for row_number, row in read_rows(self.path, self.file_format):
+            if row_number > state.rows_done:
+                yield row_number, row
+
+    async def run(self, connection) -> ImportStats:
+        """
+        Import the file over an asyncpg connection, resuming from the state file if present.
+        """
+        state = ImportState.load(self.state_file, self.path)
+        stats = ImportStats()
+        if state.rows_done:
+            log(f"resuming {self.path} after row {state.rows_done}")
+
+        await connection.execute(CREATE_STAGING_TABLE)
+
+        for chunk in chunked(self.pending_rows(state), self.chunk_size):
+            records, errors = build_records(self.source, chunk)
+            for row_number, details in errors:
+                log(f"row {row_number}: skipped, {json.dumps(details, default=str)}")
+
+            new_tags = 0
+            async with connection.transaction():
+                if records:
+                    await connection.copy_records_to_table(STAGING_TABLE, records=records, columns=STAGING_COLUMNS)
+                    stats.inserted += _inserted_count(await connection.execute(MERGE_BOOKS, self.owner_uid))
+                    new_tags = _inserted_count(await connection.execute(MERGE_TAGS))
+                    await connection.execute(MERGE_BOOK_TAGS)
+
+            # Like any other tag write: workers serve the tag list from memory until the version moves.
+            if new_tags:
+                await tag_list_cache_client.bump()
+
+            state.rows_done = chunk[-1][0]
+            state.save(self.state_file)
+
+            stats.rows += len(chunk)
+            stats.invalid += len(errors)
+            log(f"{stats.rows} rows processed, {stats.inserted} inserted, {stats.invalid} invalid "
+                f"({stats.rows_per_second:,.0f} rows/s)")
+
+        self.state_file.unlink(missing_ok=True)
+
+        return stats
+
+
+def log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.books.importer", description="Bulk import books.")
+    parser.add_argument("path", type=Path, help="CSV or NDJSON catalogue file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="file format (default: from the extension)")
+    parser.add_argument("--owner", type=uuid.UUID, help="uid of the user the books are attributed to")
+    parser.add_argument("--source", help="stable name of the feed, used to derive book uids (default: file name)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--state-file", type=Path, help="checkpoint file (default: <path>.import-state)")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    from src.db.main import async_engine
+
+    args = parse_args(argv)
+    state_file = args.state_file or args.path.with_name(args.path.name + ".import-state")
+    if args.restart:
+        state_file.unlink(missing_ok=True)
+
+    importer = BookImporter(
+        path=args.path,
+        file_format=args.format or detect_format(args.path),
+        source=args.source or args.path.name,
+        owner_uid=args.owner,
+        chunk_size=args.chunk_size,
+        state_file=state_file,
+    )
+
+    async with async_engine.connect() as conn:
+        raw_connection = await conn.get_raw_connection()
+        stats = await importer.run(raw_connection.driver_connection)
+    await async_engine.dispose()
+
+    log(f"done: {stats.rows} rows, {stats.inserted} inserted, {stats.invalid} invalid "
+        f"in {stats.elapsed:.1f}s ({stats.rows_per_second:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
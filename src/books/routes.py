@@ -1,12 +1,21 @@
-from typing import List
+import uuid
+from typing import Any, List, Optional
 
-from fastapi import status, APIRouter, Depends
+from fastapi import status, APIRouter, Body, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from src.auth.dependencies import AccessTokenBearer, RoleChecker
-from src.books.service import BookService
-from .schemas import Book, BookUpdateModel, BookCreateModel, BookDetailModel
-from src.db.main import get_session
+from src.books.service import (BookService, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, DEFAULT_SUGGESTIONS, MAX_SUGGESTIONS,
+                               MIN_SUGGEST_LENGTH)
+from .schemas import (Book, BookUpdateModel, BookCreateModel, BookDetailModel, BookPage, BookBatchResult,
+                      BookSuggestion)
+from src.config import Config
+from src.db.main import get_session, get_read_session, read_sessionmaker
+from src.http_cache import etag_matches, json_response, not_modified
+from src.responses import fast_json_response
 from ..errors import BookNotFound
 
 book_router = APIRouter()
@@ -14,30 +23,98 @@ book_service = BookService()
 access_token_bearer = AccessTokenBearer()
 role_checker = Depends(RoleChecker(['admin', 'user']))
 
+# Used by the list endpoints when FAST_JSON_RESPONSES is on.
+book_page_adapter = TypeAdapter(BookPage)
+book_list_adapter = TypeAdapter(List[Book])
 
-@book_router.get('/', response_model=List[Book], dependencies=[role_checker])
+
+@book_router.get('/', response_model=BookPage, dependencies=[role_checker])
 async def get_all_books(
-        session: AsyncSession = Depends(get_session),
+        limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        session: AsyncSession = Depends(get_read_session),
+        token_details=Depends(access_token_bearer)):
+    page = await book_service.get_all_books(session, limit=limit, cursor=cursor)
+    if Config.FAST_JSON_RESPONSES:
+        return fast_json_response(book_page_adapter, page)
+    return page
+
+
+async def _export_ndjson(request: Request, include_details: bool):
+    # The export outlives the request's dependencies (get_session is closed before a
+    # StreamingResponse body is sent), so it opens its own session for the cursor.
+    async with read_sessionmaker(request)() as session:
+        async for rows in book_service.export_books(session, include_details=include_details):
+            yield b"".join(to_json(row) + b"\n" for row in rows)
+
+
+@book_router.get('/export', dependencies=[role_checker])
+async def export_books(request: Request, include_details: bool = False,
+                       token_details=Depends(access_token_bearer)):
+    return StreamingResponse(_export_ndjson(request, include_details), media_type="application/x-ndjson")
+
+
+@book_router.get('/search', response_model=BookPage, dependencies=[role_checker])
+async def search_books(
+        q: str = Query(min_length=1, max_length=200),
+        language: Optional[str] = None,
+        limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        session: AsyncSession = Depends(get_read_session),
         token_details=Depends(access_token_bearer)):
-    books = await book_service.get_all_books(session)
+    page = await book_service.search_books(session, q, limit=limit, cursor=cursor, language=language)
+    if Config.FAST_JSON_RESPONSES:
+        return fast_json_response(book_page_adapter, page)
+    return page
+
+
+@book_router.get('/suggest', response_model=List[BookSuggestion], dependencies=[role_checker])
+async def suggest_books(
+        response: Response,
+        q: str = Query(min_length=MIN_SUGGEST_LENGTH, max_length=100),
+        limit: int = Query(default=DEFAULT_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS),
+        session: AsyncSession = Depends(get_read_session),
+        token_details=Depends(access_token_bearer)):
+    # Typeahead fires on every keystroke; let the browser reuse answers for a short while.
+    response.headers["Cache-Control"] = f"private, max-age={Config.SUGGEST_CACHE_MAX_AGE}"
+    suggestions = await book_service.suggest_titles(q, session, limit=limit)
+    return suggestions
+
+
+@book_router.get('/top-rated', response_model=List[Book], dependencies=[role_checker])
+async def get_top_rated_books(
+        limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        session: AsyncSession = Depends(get_read_session),
+        token_details=Depends(access_token_bearer)):
+    books = await book_service.get_top_rated_books(session, limit=limit)
+    if Config.FAST_JSON_RESPONSES:
+        return fast_json_response(book_list_adapter, books)
     return books
 
 
 @book_router.get('/user/{user_uid}', response_model=List[Book], dependencies=[role_checker])
 async def get_user_book_submissions(
-        user_uid: str,
-        session: AsyncSession = Depends(get_session),
+        user_uid: uuid.UUID,
+        session: AsyncSession = Depends(get_read_session),
         token_details=Depends(access_token_bearer)):
     books = await book_service.get_user_books(user_uid, session)
+    if Config.FAST_JSON_RESPONSES:
+        return fast_json_response(book_list_adapter, books)
     return books
 
 
 @book_router.get('/{book_uid}', response_model=BookDetailModel, dependencies=[role_checker])
-async def get_book(book_uid: str, session: AsyncSession = Depends(get_session),
-                   token_details=Depends(access_token_bearer)) -> dict:
-    book = await book_service.get_book_by_id(book_uid, session)
-    if book:
-        return book
+async def get_book(book_uid: uuid.UUID, request: Request, session: AsyncSession = Depends(get_session),
+                   token_details=Depends(access_token_bearer)) -> Response:
+    # The ETag and cache hits come from Redis alone. Misses read the primary: filling the
+    # shared cache from a lagging replica would keep serving the stale copy until the TTL expires.
+    etag = await book_service.get_book_etag(book_uid)
+    if etag is not None and etag_matches(request, etag):
+        return not_modified(etag)
+
+    payload = await book_service.get_book_detail_json(book_uid, session, etag)
+    if payload is not None:
+        return json_response(payload, etag)
     else:
         raise BookNotFound()
 
@@ -50,6 +127,18 @@ async def create_a_book(book_data: BookCreateModel, session: AsyncSession = Depe
     return new_book
 
 
+@book_router.post('/batch', status_code=status.HTTP_207_MULTI_STATUS, response_model=BookBatchResult,
+                  dependencies=[role_checker])
+async def create_books_batch(
+        books_data: List[Any] = Body(max_length=Config.BOOK_BATCH_MAX_SIZE),
+        session: AsyncSession = Depends(get_session),
+        token_details=Depends(access_token_bearer)) -> dict:
+    # Items are taken as raw JSON values and validated per item in the service, so one bad
+    # row (even one that is not an object) is reported in the per-item results instead of rejecting the whole request.
+    user_id = token_details.get('user')['user_uid']
+    return await book_service.create_books(books_data, user_id, session)
+
+
 @book_router.patch('/{book_uid}', status_code=status.HTTP_200_OK, response_model=Book,
                    dependencies=[role_checker])
 async def update_book(book_uid: str, book_update_data: BookUpdateModel,
@@ -1,8 +1,8 @@
-from typing import List
+from typing import Any, List, Optional
 import uuid
 from pydantic import BaseModel
 from datetime import datetime, date
-from src.reviews.schemas import ReviewModel
+from src.reviews.schemas import ReviewModel, ReviewStatsModel
 from src.tags.schemas import TagModel
 
 
@@ -16,6 +16,8 @@ class Book(BaseModel):
     language: str
     created_at: datetime
     updated_at: datetime
+    # None until the book gets its first review.
+    review_stats: Optional[ReviewStatsModel] = None
 
 
 class BookDetailModel(Book):
@@ -23,6 +25,16 @@ class BookDetailModel(Book):
     tags: List[TagModel]
 
 
+class BookPage(BaseModel):
+    items: List[Book]
+    next_cursor: Optional[str] = None
+
+
+class BookSuggestion(BaseModel):
+    uid: uuid.UUID
+    title: str
+
+
 class BookCreateModel(BaseModel):
     title: str
     author: str
@@ -32,6 +44,19 @@ class BookCreateModel(BaseModel):
     language: str
 
 
+class BookBatchItemResult(BaseModel):
+    index: int
+    status: int
+    uid: Optional[uuid.UUID] = None
+    errors: Optional[List[dict[str, Any]]] = None
+
+
+class BookBatchResult(BaseModel):
+    created: int
+    failed: int
+    items: List[BookBatchItemResult]
+
+
 class BookUpdateModel(BaseModel):
     title: str
     author: str
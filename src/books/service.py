@@ -1,43 +1,376 @@
+import uuid
+from datetime import datetime, timezone
+from functools import reduce
+from typing import Any, AsyncIterator, Optional
+
+from fastapi import status
+from pydantic import ValidationError
+from sqlalchemy import Float, String, bindparam, cast, func, insert, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSQUERY, TSVECTOR
+from sqlalchemy.orm import joinedload, selectinload
 from sqlmodel import select, desc
 from sqlmodel.ext.asyncio.session import AsyncSession
-from .schemas import BookCreateModel, BookUpdateModel
-from src.db.models import Book
+from .schemas import BookCreateModel, BookDetailModel, BookUpdateModel
+from .utils import decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor
+from src.db.models import Book, BookReviewStats, BookTag, Tag
+from src.db.redis import book_cache_client, tag_list_cache_client
+from src.db.utils import escape_like
+from src.http_cache import make_etag
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# pg_trgm extracts no full trigram from one or two characters, so shorter input would turn
+# the trigram index lookup into a scan of the whole index.
+MIN_SUGGEST_LENGTH = 3
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 25
+EXPORT_BATCH_SIZE = 1000
+# PostgreSQL's wire protocol (and so asyncpg) allows at most 32767 bind parameters per statement.
+MAX_BIND_PARAMS = 32767
+
+# The scalar columns of the Book schema. List endpoints and the export select these directly
+# and build plain dicts, skipping ORM instances and the identity map for rows that are only
+# going to be serialized.
+BOOK_COLUMNS = (
+    Book.uid,
+    Book.title,
+    Book.author,
+    Book.publisher,
+    Book.published_date,
+    Book.page_count,
+    Book.language,
+    Book.created_at,
+    Book.updated_at,
+)
+REVIEW_STATS_COLUMNS = (
+    BookReviewStats.review_count,
+    BookReviewStats.average_rating,
+    BookReviewStats.rating_histogram,
+)
+
+# Generated tsvector over title, author and publisher; it lives only in the PostgreSQL schema
+# (see the add_books_search_vector migration), so it is not a column of the Book model.
+BOOK_SEARCH_VECTOR = literal_column("books.search_vector", type_=TSVECTOR)
+
+# Text search configurations books_search_config() maps Book.language to. A query without an
+# explicit language is parsed with each of them, so it matches whatever stemming a book got.
+SEARCH_CONFIGS = ("simple", "english", "spanish", "french", "german", "italian", "portuguese", "russian", "dutch")
+
+# Loader options for single books loaded as ORM objects. Relationships are lazy="raise", so a
+# query renders only what it loads here: the Book schema embeds the review stats (one-to-one,
+# joined into the same query), BookDetailModel also the reviews and tags (one IN query each).
+BOOK_OPTIONS = (joinedload(Book.review_stats),)
+BOOK_DETAIL_OPTIONS = (*BOOK_OPTIONS, selectinload(Book.reviews), selectinload(Book.tags))
+
+
+def book_row_to_dict(row) -> dict:
+    """
+    Shape a row selected with BOOK_COLUMNS + REVIEW_STATS_COLUMNS like the Book schema:
+    the stats columns nest under review_stats, which is None for books without a stats row.
+    """
+    book = row._asdict()
+    review_stats = {"review_count": book.pop("review_count"), "average_rating": book.pop("average_rating"),
+                    "rating_histogram": book.pop("rating_histogram")}
+    book["review_stats"] = review_stats if review_stats["review_count"] is not None else None
+
+    return book
+
+
+def book_list_statement():
+    return (
+        select(*BOOK_COLUMNS, *REVIEW_STATS_COLUMNS)
+        .outerjoin(BookReviewStats, BookReviewStats.book_uid == Book.uid)
+    )
 
 
 class BookService:
-    async def get_all_books(self, session: AsyncSession):
-        statement = select(Book).order_by(desc(Book.created_at))
+    async def get_all_books(self, session: AsyncSession, limit: int = DEFAULT_PAGE_SIZE,
+                            cursor: Optional[str] = None):
+        """
+        Return one page of books, newest first, using keyset pagination on (created_at, uid).
+
+        One extra row is fetched to know whether another page exists; when it does,
+        next_cursor points just after the last returned book.
+        """
+        statement = book_list_statement().order_by(desc(Book.created_at), desc(Book.uid)).limit(limit + 1)
+
+        if cursor is not None:
+            created_at, uid = decode_cursor(cursor)
+            statement = statement.where(tuple_(Book.created_at, Book.uid) < tuple_(created_at, uid))
+
+        result = await session.exec(statement)
+        books = [book_row_to_dict(row) for row in result.all()]
+
+        next_cursor = None
+        if len(books) > limit:
+            books = books[:limit]
+            last = books[-1]
+            next_cursor = encode_cursor(last["created_at"], last["uid"])
+
+        return {"items": books, "next_cursor": next_cursor}
+
+    async def export_books(self, session: AsyncSession, include_details: bool = False,
+                           batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[list[dict]]:
+        """
+        Yield the whole catalogue in batches of plain dicts, read through a server-side cursor.
+
+        Only scalar columns are selected, so no ORM objects or relationship loads are
+        built and memory stays bounded by batch_size. With include_details, each batch
+        gets its tag names and review count/average from two extra IN queries.
+        """
+        statement = (
+            select(*BOOK_COLUMNS)
+            .order_by(Book.created_at, Book.uid)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await session.stream(statement)
+
+        async for partition in result.mappings().partitions():
+            rows = [dict(row) for row in partition]
+            if include_details:
+                await self._add_export_details(rows, session)
+
+            yield rows
+
+    async def _add_export_details(self, rows: list[dict], session: AsyncSession) -> None:
+        uids = [row["uid"] for row in rows]
+        tag_names = {uid: [] for uid in uids}
+        review_stats = {}
+
+        tags_statement = (
+            select(BookTag.book_id, Tag.name)
+            .join(Tag, Tag.uid == BookTag.tag_id)
+            .where(BookTag.book_id.in_(uids))
+            .order_by(Tag.name)
+        )
+        for book_id, name in (await session.exec(tags_statement)).all():
+            tag_names[book_id].append(name)
+
+        stats_statement = (
+            select(BookReviewStats.book_uid, BookReviewStats.review_count, BookReviewStats.average_rating)
+            .where(BookReviewStats.book_uid.in_(uids))
+        )
+        for book_uid, review_count, average_rating in (await session.exec(stats_statement)).all():
+            review_stats[book_uid] = (review_count, average_rating)
+
+        for row in rows:
+            review_count, average_rating = review_stats.get(row["uid"], (0, None))
+            row["tags"] = tag_names[row["uid"]]
+            row["review_count"] = review_count
+            row["average_rating"] = average_rating
+
+    def build_search_statement(self, q: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+                               language: Optional[str] = None):
+        """
+        Full-text search over books.search_vector, best ts_rank first, with (rank, uid) keyset paging.
+        """
+        text = bindparam("q", q, type_=String)
+        if language is not None:
+            query = func.websearch_to_tsquery(func.books_search_config(language), text, type_=TSQUERY)
+        else:
+            query = reduce(
+                lambda left, right: left.op("||", return_type=TSQUERY)(right),
+                [func.websearch_to_tsquery(cast(config, REGCONFIG), text, type_=TSQUERY) for config in SEARCH_CONFIGS],
+            )
+        # Parse the query once per statement rather than once per candidate row.
+        search_query = select(query.label("query")).subquery("search_query")
+        rank = func.ts_rank(BOOK_SEARCH_VECTOR, search_query.c.query, type_=Float)
+        rank_label = rank.label("rank")
+
+        statement = (
+            book_list_statement()
+            .add_columns(rank_label)
+            .where(BOOK_SEARCH_VECTOR.op("@@")(search_query.c.query))
+            .order_by(desc(rank_label), desc(Book.uid))
+            .limit(limit + 1)
+        )
+
+        if cursor is not None:
+            after_rank, after_uid = decode_rank_cursor(cursor)
+            statement = statement.where(tuple_(rank, Book.uid) < tuple_(after_rank, after_uid))
+
+        return statement
+
+    async def search_books(self, session: AsyncSession, q: str, limit: int = DEFAULT_PAGE_SIZE,
+                           cursor: Optional[str] = None, language: Optional[str] = None):
+        """
+        Return one page of search results in the same shape as get_all_books.
+        Requires PostgreSQL: the search vector and books_search_config() exist only there.
+        """
+        result = await session.exec(self.build_search_statement(q, limit=limit, cursor=cursor, language=language))
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].uid)
+
+        books = []
+        for row in rows:
+            book = book_row_to_dict(row)
+            del book["rank"]
+            books.append(book)
+
+        return {"items": books, "next_cursor": next_cursor}
+
+    async def suggest_titles(self, q: str, session: AsyncSession, limit: int = DEFAULT_SUGGESTIONS):
+        """
+        Typeahead over book titles: substring match served by the pg_trgm GIN index on
+        books.title, closest titles first. Requires PostgreSQL (similarity() comes from pg_trgm).
+        """
+        statement = (
+            select(Book.uid, Book.title)
+            .where(Book.title.ilike(f"%{escape_like(q)}%", escape="\\"))
+            .order_by(desc(func.similarity(Book.title, q)), Book.title)
+            .limit(limit)
+        )
         result = await session.exec(statement)
 
-        return result.all()
+        return [{"uid": uid, "title": title} for uid, title in result.all()]
+
+    async def get_top_rated_books(self, session: AsyncSession, limit: int = DEFAULT_PAGE_SIZE):
+        """
+        Books with at least one review, best average rating first (ties broken by review count),
+        read straight off the review stats ranking index.
+        """
+        statement = (
+            select(*BOOK_COLUMNS, *REVIEW_STATS_COLUMNS)
+            .join(BookReviewStats, BookReviewStats.book_uid == Book.uid)
+            .where(BookReviewStats.review_count > 0)
+            .order_by(desc(BookReviewStats.average_rating), desc(BookReviewStats.review_count),
+                      desc(BookReviewStats.book_uid))
+            .limit(limit)
+        )
+        result = await session.exec(statement)
+
+        return [book_row_to_dict(row) for row in result.all()]
 
     async def get_user_books(self, user_uid: str, session: AsyncSession):
-        statement = select(Book).where(Book.user_uid == user_uid).order_by(desc(Book.created_at))
+        statement = book_list_statement().where(Book.user_uid == user_uid).order_by(desc(Book.created_at))
         result = await session.exec(statement)
 
-        return result.all()
+        return [book_row_to_dict(row) for row in result.all()]
 
-    async def get_book_by_id(self, book_uid: str, session: AsyncSession):
-        statement = select(Book).where(Book.uid == book_uid)
+    async def get_book_by_id(self, book_uid: str, session: AsyncSession, options: tuple = ()):
+        """
+        Load one book with the given loader options, e.g. BOOK_OPTIONS to render it as a Book.
+        Without options no relationship is loaded.
+        """
+        statement = select(Book).options(*options).where(Book.uid == book_uid)
         result = await session.exec(statement)
 
         book = result.first()
 
         return book if book is not None else None
 
+    async def get_book_etag(self, book_uid: str) -> str | None:
+        """
+        Strong ETag for the book's detail representation, from two version stamps kept in
+        Redis: the book's own, bumped whenever the book, its reviews or its tags change, and
+        the tag list's (tag renames). No database query is needed to compute it.
+
+        Returns None when either stamp is unavailable, since a change could then go unnoticed;
+        callers skip conditional handling and the cache in that case. A book only gets a stamp
+        once it has been loaded or written, so an unknown uid never has an ETag.
+        """
+        book_version = await book_cache_client.version(book_uid)
+        if book_version is None:
+            return None
+
+        tags_version = await tag_list_cache_client.version()
+        if tags_version is None:
+            return None
+
+        return make_etag("book", uuid.UUID(str(book_uid)), book_version, tags_version)
+
+    async def get_book_detail_json(self, book_uid: str, session: AsyncSession, etag: str | None = None) -> bytes | None:
+        """
+        Read-through cache around get_book_by_id: return the rendered BookDetailModel JSON
+        from Redis, or load and render it on a miss. Returns None if the book does not exist.
+
+        Cache entries are stored with the ETag they were rendered for and only served for
+        that same ETag, so a copy cached just before a write is never sent under the new one.
+        Compute the ETag before calling this, as the route does, so that a write committed
+        while the book is being loaded still moves the version past the copy cached here.
+        Without an ETag the cache is bypassed, and a book that was found gets its version
+        stamp started so the next request has one.
+        """
+        if etag is not None:
+            cached = await book_cache_client.get(book_uid)
+            if cached is not None:
+                cached_etag, _, payload = cached.partition(b"\n")
+                if cached_etag == etag.encode():
+                    return payload
+
+        book = await self.get_book_by_id(book_uid, session, options=BOOK_DETAIL_OPTIONS)
+        if book is None:
+            return None
+
+        payload = BookDetailModel.model_validate(book, from_attributes=True).model_dump_json().encode()
+        if etag is not None:
+            await book_cache_client.set(book_uid, etag.encode() + b"\n" + payload)
+        else:
+            await book_cache_client.start_version(book_uid)
+
+        return payload
+
     async def create_book(self, book_data: BookCreateModel, user_uid: str, session: AsyncSession):
         book_data_dict = book_data.model_dump()
 
         new_book = Book(**book_data_dict)
         new_book.user_uid = user_uid
+        # A new book has no review stats yet; set that explicitly so rendering it needs no load.
+        new_book.review_stats = None
 
         session.add(new_book)
         await session.commit()
 
         return new_book
 
+    async def create_books(self, items: list[Any], user_uid: str, session: AsyncSession):
+        """
+        Create many books in one transaction with multi-row INSERTs, as few as the bind
+        parameter limit allows (one for a default-sized batch).
+
+        Items are validated one by one against BookCreateModel; invalid ones are reported
+        back with their validation errors instead of failing the whole batch.
+        """
+        now = datetime.now(timezone.utc)
+        owner_uid = uuid.UUID(str(user_uid))
+        rows = []
+        results = []
+
+        for index, item in enumerate(items):
+            try:
+                book_data = BookCreateModel.model_validate(item)
+            except ValidationError as e:
+                results.append({
+                    "index": index,
+                    "status": status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    "errors": e.errors(include_url=False, include_context=False, include_input=False),
+                })
+                continue
+
+            book_uid = uuid.uuid4()
+            rows.append({
+                **book_data.model_dump(),
+                "uid": book_uid,
+                "user_uid": owner_uid,
+                "created_at": now,
+                "updated_at": now,
+            })
+            results.append({"index": index, "status": status.HTTP_201_CREATED, "uid": book_uid})
+
+        if rows:
+            rows_per_insert = MAX_BIND_PARAMS // len(rows[0])
+            for start in range(0, len(rows), rows_per_insert):
+                await session.exec(insert(Book).values(rows[start:start + rows_per_insert]))
+            await session.commit()
+
+        return {"created": len(rows), "failed": len(items) - len(rows), "items": results}
+
     async def update_book(self, book_uid: str, update_data: BookUpdateModel, session: AsyncSession):
-        book_to_update = await self.get_book_by_id(book_uid, session)
+        book_to_update = await self.get_book_by_id(book_uid, session, options=BOOK_OPTIONS)
 
         if book_to_update is not None:
             update_data_dict = update_data.model_dump()
@@ -45,6 +378,7 @@ class BookService:
             for key, value in update_data_dict.items():
                 setattr(book_to_update, key, value)
             await session.commit()
+            await book_cache_client.invalidate(book_uid)
 
             return book_to_update
 
@@ -57,6 +391,7 @@ class BookService:
         if book_to_delete is not None:
             await session.delete(book_to_delete)
             await session.commit()
+            await book_cache_client.forget(book_uid)
 
             return {}
 
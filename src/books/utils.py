@@ -0,0 +1,59 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from src.errors import InvalidCursor
+
+
+def _encode(values: list) -> str:
+    payload = json.dumps(values, separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(created_at: datetime, uid: uuid.UUID) -> str:
+    """
+    Build an opaque keyset cursor pointing just after the given (created_at, uid) row.
+    """
+    return _encode([created_at.isoformat(), str(uid)])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+    Turn a cursor produced by encode_cursor back into its (created_at, uid) key.
+    Raises InvalidCursor for anything that was not produced by encode_cursor.
+    """
+    try:
+        created_at, uid = _decode(cursor)
+
+        return datetime.fromisoformat(created_at), uuid.UUID(uid)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor() from e
+
+
+def encode_rank_cursor(rank: float, uid: uuid.UUID) -> str:
+    """
+    Keyset cursor for result lists ordered by a relevance score, e.g. full-text search.
+    """
+    return _encode([rank, str(uid)])
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    """
+    Inverse of encode_rank_cursor; raises InvalidCursor for anything else.
+    """
+    try:
+        rank, uid = _decode(cursor)
+        if not isinstance(rank, (int, float)) or isinstance(rank, bool):
+            raise TypeError(rank)
+
+        return float(rank), uuid.UUID(uid)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor() from e
@@ -7,10 +7,31 @@ load_dotenv()
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_STRATEGY: str = "round_robin"
+    READ_YOUR_WRITES_WINDOW: int = 5
     DB_HOST_TO_PG: str
     JWT_SECRET: str
     JWT_ALGORITHM: str
     REDIS_URL: str = "redis://redis:6379/0"
+    BOOK_CACHE_TTL: int = 300
+    BOOK_BATCH_MAX_SIZE: int = 1000
+    SUGGEST_CACHE_MAX_AGE: int = 30
+    FAST_JSON_RESPONSES: bool = False
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    DEBUG: bool = False
+    SLOW_QUERY_MS: float = 200.0
+    BLOCKLIST_LOCAL_TTL: float = 10.0
+    BLOCKLIST_LOCAL_MAXSIZE: int = 10000
+    AUTH_TRUST_TOKEN_CLAIMS: bool = True
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
     DOMAIN: str
     MAIL_USERNAME: str
     MAIL_PASSWORD: str
@@ -0,0 +1,116 @@
+import contextvars
+import logging
+import re
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import Config
+from src.metrics import DB_QUERIES_PER_REQUEST
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+# Expanded IN lists and multi-row VALUES produce one placeholder per element.
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|\$\d+|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|\$\d+|%s|%\(\w+\)s|:\w+))+\s*\)")
+_REPEATED_LIST = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+_query_stats: contextvars.ContextVar[QueryStats | None] = contextvars.ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _query_stats.get()
+
+
+def track_queries() -> tuple[QueryStats, contextvars.Token]:
+    """
+    Start counting statements for the current context (a request, a test, a script).
+    Pass the token to stop_tracking_queries when done.
+    """
+    stats = QueryStats()
+    return stats, _query_stats.set(stats)
+
+
+def stop_tracking_queries(token: contextvars.Token) -> None:
+    _query_stats.reset(token)
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Reduce a statement to its shape for logging and grouping: literals become ?, and
+    placeholder lists of any length collapse to (...).
+    """
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(...)", statement)
+    statement = _REPEATED_LIST.sub("(...)", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.query_start
+
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+    if elapsed * 1000 >= Config.SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, normalize_sql(statement))
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Time every statement the engine runs, attributing it to the tracked context, if any,
+    and logging those slower than SLOW_QUERY_MS.
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    Tracks the statements each HTTP request runs. The count feeds a per-route histogram;
+    with DEBUG on, count and time are also sent back in a Server-Timing header.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = track_queries()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and Config.DEBUG:
+                timing = f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_tracking_queries(token)
+            route = scope.get("route")
+            if route is not None:
+                DB_QUERIES_PER_REQUEST.labels(scope["method"], route.path).observe(stats.count)
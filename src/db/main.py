@@ -1,14 +1,83 @@
+import itertools
+import time
+
+from fastapi import Request, Response
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel import create_engine, SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import Config
+from src.db.instrumentation import instrument_engine
+from src.metrics import DB_CHECKOUT_SECONDS, DB_POOL_CHECKED_OUT
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default async queue pool, recording how long each checkout waited for a connection
+    and how many connections are checked out, labelled with the pool's name ("primary",
+    "replica-0", ...) so the primary and each replica can be sized separately.
+    """
+
+    name = "primary"
+
+    def recreate(self):
+        # dispose() swaps in a fresh pool built from the constructor arguments only.
+        pool = super().recreate()
+        pool.name = self.name
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        finally:
+            DB_CHECKOUT_SECONDS.labels(self.name).observe(time.perf_counter() - start)
+        DB_POOL_CHECKED_OUT.labels(self.name).inc()
+
+        return connection
+
+    def _do_return_conn(self, record):
+        DB_POOL_CHECKED_OUT.labels(self.name).dec()
+        super()._do_return_conn(record)
 
-async_engine = AsyncEngine(
-    create_engine(
-        url=Config.DATABASE_URL
-    )
-)
+
+def create_db_engine(url: str, name: str = "primary") -> AsyncEngine:
+    """
+    Build an async engine with pool sizing and asyncpg statement caching taken from Settings.
+    SQLite (used by the tests) keeps SQLAlchemy's default pool. The name labels the pool's metrics.
+    """
+    db_url = make_url(url)
+    engine_kwargs = {}
+
+    if db_url.get_backend_name() != "sqlite":
+        engine_kwargs.update(
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=Config.DB_POOL_SIZE,
+            max_overflow=Config.DB_MAX_OVERFLOW,
+            pool_timeout=Config.DB_POOL_TIMEOUT,
+            pool_recycle=Config.DB_POOL_RECYCLE,
+            pool_pre_ping=Config.DB_POOL_PRE_PING,
+        )
+
+    if db_url.get_driver_name() == "asyncpg":
+        # asyncpg's own statement cache plus SQLAlchemy's prepared statement cache on top of it;
+        # set DB_STATEMENT_CACHE_SIZE=0 behind pgbouncer in transaction mode.
+        engine_kwargs["connect_args"] = {
+            "statement_cache_size": Config.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": Config.DB_STATEMENT_CACHE_SIZE,
+        }
+
+    engine = AsyncEngine(create_engine(url=url, **engine_kwargs))
+    if isinstance(engine.sync_engine.pool, InstrumentedAsyncQueuePool):
+        engine.sync_engine.pool.name = name
+    instrument_engine(engine)
+
+    return engine
+
+
+async_engine = create_db_engine(Config.DATABASE_URL)
 
 
 async def init_db():
@@ -25,6 +94,71 @@ async_session = async_sessionmaker(
 )
 
 
-async def get_session() -> AsyncSession:
+READ_PRIMARY_HEADER = "x-read-consistency"
+READ_PRIMARY_COOKIE = "read_primary"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRouter:
+    """
+    Spreads read-only sessions over one or more replica engines,
+    either round-robin or to the replica with the fewest connections checked out.
+    """
+
+    strategies = ("round_robin", "least_connections")
+
+    def __init__(self, urls: list[str], strategy: str = "round_robin"):
+        if strategy not in self.strategies:
+            raise ValueError(f"Unknown replica strategy {strategy!r}, expected one of {self.strategies}")
+
+        self.strategy = strategy
+        self.engines = [create_db_engine(url, f"replica-{index}") for index, url in enumerate(urls)]
+        self.sessionmakers = [
+            async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+            for engine in self.engines
+        ]
+        self._turn = itertools.count()
+
+    def pick(self) -> async_sessionmaker:
+        if self.strategy == "least_connections":
+            index = min(range(len(self.engines)), key=lambda i: self.engines[i].sync_engine.pool.checkedout())
+        else:
+            index = next(self._turn) % len(self.engines)
+
+        return self.sessionmakers[index]
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+replica_urls = [url.strip() for url in Config.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+replica_router = ReplicaRouter(replica_urls, Config.DB_REPLICA_STRATEGY) if replica_urls else None
+
+
+async def get_session(request: Request, response: Response) -> AsyncSession:
+    # Reads that follow a write from the same client go to the primary for a short
+    # while, so they see their own changes despite replication lag.
+    if request.method not in SAFE_METHODS and replica_router is not None:
+        response.set_cookie(READ_PRIMARY_COOKIE, "1", max_age=Config.READ_YOUR_WRITES_WINDOW, httponly=True)
+
     async with async_session() as session:
         yield session
+
+
+def read_sessionmaker(request: Request) -> async_sessionmaker:
+    """
+    The session factory for a read-only request: a replica, unless none are configured or the
+    client asked for primary reads (X-Read-Consistency: primary, or the read-your-writes cookie).
+    """
+    if replica_router is None:
+        return async_session
+    if request.headers.get(READ_PRIMARY_HEADER) == "primary" or request.cookies.get(READ_PRIMARY_COOKIE):
+        return async_session
+
+    return replica_router.pick()
+
+
+async def get_read_session(request: Request) -> AsyncSession:
+    async with read_sessionmaker(request)() as session:
+        yield session
@@ -1,6 +1,7 @@
 from typing import List, Optional
-from sqlmodel import SQLModel, Field, Column, Relationship
+from sqlmodel import SQLModel, Field, Column, Relationship, Index
 import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy import JSON, Uuid
 from datetime import datetime, timezone, date
 import uuid
 
@@ -13,7 +14,7 @@ class User(SQLModel, table=True):
         default_factory=uuid.uuid4
     )
     username: str
-    email: str
+    email: str = Field(unique=True, index=True)
     password_hash: str = Field(exclude=True)
     first_name: str
     last_name: str
@@ -28,8 +29,10 @@ class User(SQLModel, table=True):
             onupdate=lambda: datetime.now(timezone.utc),
         )
     )
-    books: List["Book"] = Relationship(back_populates="user", sa_relationship_kwargs={'lazy': 'selectin'})
-    reviews: List["Review"] = Relationship(back_populates="user", sa_relationship_kwargs={'lazy': 'selectin'})
+    # Relationships are never loaded implicitly: queries that need them ask for them with
+    # loader options (selectinload/joinedload), and touching one that was not loaded raises.
+    books: List["Book"] = Relationship(back_populates="user", sa_relationship_kwargs={'lazy': 'raise'})
+    reviews: List["Review"] = Relationship(back_populates="user", sa_relationship_kwargs={'lazy': 'raise'})
 
     def __repr__(self):
         return f"<User {self.username}>"
@@ -37,20 +40,20 @@ class User(SQLModel, table=True):
 
 class BookTag(SQLModel, table=True):
     book_id: uuid.UUID = Field(default=None, foreign_key="books.uid", primary_key=True)
-    tag_id: uuid.UUID = Field(default=None, foreign_key="tags.uid", primary_key=True)
+    tag_id: uuid.UUID = Field(default=None, foreign_key="tags.uid", primary_key=True, index=True)
 
 
 class Tag(SQLModel, table=True):
     __tablename__ = "tags"
     uid: uuid.UUID = Field(
-        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+        sa_column=Column(Uuid, nullable=False, primary_key=True, default=uuid.uuid4)
     )
-    name: str = Field(sa_column=Column(pg.VARCHAR, nullable=False))
+    name: str = Field(sa_column=Column(pg.VARCHAR, nullable=False, unique=True, index=True))
     created_at: datetime = Field(sa_column=Column(pg.TIMESTAMP, default=datetime.now))
     books: List["Book"] = Relationship(
         link_model=BookTag,
         back_populates="tags",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise"},
     )
 
     def __repr__(self) -> str:
@@ -59,6 +62,11 @@ class Tag(SQLModel, table=True):
 
 class Book(SQLModel, table=True):
     __tablename__ = "books"
+    __table_args__ = (
+        # Keyset pagination order for the catalogue, and per-user listings in the same order.
+        Index("ix_books_created_at_uid", "created_at", "uid"),
+        Index("ix_books_user_uid_created_at", "user_uid", "created_at"),
+    )
 
     uid: uuid.UUID = Field(
         primary_key=True,
@@ -80,18 +88,50 @@ class Book(SQLModel, table=True):
             onupdate=lambda: datetime.now(timezone.utc),
         )
     )
-    user: Optional[User] = Relationship(back_populates="books")
-    reviews: List["Review"] = Relationship(back_populates="book", sa_relationship_kwargs={'lazy': 'selectin'})
+    user: Optional[User] = Relationship(back_populates="books", sa_relationship_kwargs={'lazy': 'raise'})
+    reviews: List["Review"] = Relationship(back_populates="book", sa_relationship_kwargs={'lazy': 'raise'})
     tags: List[Tag] = Relationship(
         link_model=BookTag,
         back_populates="books",
-        sa_relationship_kwargs={"lazy": "selectin"},
+        sa_relationship_kwargs={"lazy": "raise"},
+    )
+    review_stats: Optional["BookReviewStats"] = Relationship(
+        sa_relationship_kwargs={"lazy": "raise", "uselist": False, "cascade": "all, delete-orphan"},
     )
 
     def __repr__(self):
         return f"<Book {self.title}>"
 
 
+class BookReviewStats(SQLModel, table=True):
+    """
+    Review aggregates for one book, maintained incrementally by ReviewService so that
+    reading a book's rating never has to scan its reviews.
+    """
+    __tablename__ = "book_review_stats"
+    __table_args__ = (
+        Index("ix_book_review_stats_ranking", "average_rating", "review_count", "book_uid"),
+    )
+
+    book_uid: uuid.UUID = Field(primary_key=True, foreign_key="books.uid", ondelete="CASCADE")
+    review_count: int = Field(default=0)
+    rating_sum: int = Field(default=0)
+    average_rating: Optional[float] = Field(default=None)
+    # Number of reviews per rating value, keyed by the rating as a string (JSON object keys).
+    rating_histogram: dict = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    updated_at: datetime = Field(
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=True),
+            nullable=False,
+            default=lambda: datetime.now(timezone.utc),
+            onupdate=lambda: datetime.now(timezone.utc),
+        )
+    )
+
+    def __repr__(self):
+        return f"<BookReviewStats for book {self.book_uid}: {self.review_count} reviews>"
+
+
 class Review(SQLModel, table=True):
     __tablename__ = "reviews"
 
@@ -101,8 +141,8 @@ class Review(SQLModel, table=True):
     )
     rating: int = Field(lt=5)
     review_text: str
-    user_uid: Optional[uuid.UUID] = Field(default=None, foreign_key="users.uid")
-    book_uid: Optional[uuid.UUID] = Field(default=None, foreign_key="books.uid")
+    user_uid: Optional[uuid.UUID] = Field(default=None, foreign_key="users.uid", index=True)
+    book_uid: Optional[uuid.UUID] = Field(default=None, foreign_key="books.uid", index=True)
     created_at: datetime = Field(sa_column=Column(pg.TIMESTAMP(timezone=True), default=datetime.now(timezone.utc)))
     updated_at: datetime = Field(
         sa_column=Column(
@@ -112,8 +152,8 @@ class Review(SQLModel, table=True):
             onupdate=lambda: datetime.now(timezone.utc),
         )
     )
-    user: Optional[User] = Relationship(back_populates="reviews")
-    book: Optional[Book] = Relationship(back_populates="reviews")
+    user: Optional[User] = Relationship(back_populates="reviews", sa_relationship_kwargs={'lazy': 'raise'})
+    book: Optional[Book] = Relationship(back_populates="reviews", sa_relationship_kwargs={'lazy': 'raise'})
 
     def __repr__(self):
         return f"<Review for book {self.book_uid} by user {self.user_uid}>"
@@ -1,6 +1,13 @@
+import asyncio
 import logging
+import time
+import uuid
 import redis.asyncio as redis
+from redis.exceptions import RedisError
 from src.config import Config
+from src.db.local_cache import TTLCache
+from src.metrics import (BLOCKLIST_LOCAL_HITS, BLOCKLIST_LOCAL_MISSES, BOOK_CACHE_HITS, BOOK_CACHE_MISSES,
+                         REDIS_COMMAND_SECONDS, TAG_LIST_CACHE_HITS, TAG_LIST_CACHE_MISSES)
 
 logger = logging.getLogger(__name__)
 
@@ -8,13 +15,27 @@ logger = logging.getLogger(__name__)
 class TokenBlocklistClient:
     """
     A class-based Redis client for managing blocked JTIs (token IDs).
+
+    Lookups go through a bounded in-process cache first. Revoked JTIs are cached for
+    their whole lifetime; "not revoked" answers only for local_ttl seconds. Revocations
+    are broadcast over Redis pub/sub so other workers learn about them immediately, and
+    local_ttl bounds how long a worker can miss one if a message is lost. Local cache
+    hits and misses are exported as Prometheus counters.
     """
 
-    def __init__(self, expiry: int = 3600):
+    channel = "token_blocklist:revoked"
+
+    def __init__(self, expiry: int = 3600, local_ttl: float = Config.BLOCKLIST_LOCAL_TTL,
+                 local_maxsize: int = Config.BLOCKLIST_LOCAL_MAXSIZE):
         """
-        :param expiry: Time-to-live in seconds for each JTI (default: 1 day).
+        :param expiry: Time-to-live in seconds for each JTI (default: 1 hour).
+        :param local_ttl: Seconds a negative lookup may be served from the local cache.
+        :param local_maxsize: Maximum number of JTIs kept in the local cache.
         """
         self.expiry = expiry
+        self.local_ttl = local_ttl
+        self.local_cache = TTLCache(maxsize=local_maxsize, ttl=local_ttl)
+        self._listener: asyncio.Task | None = None
         # Create an async Redis client from a single URL
         self.redis = redis.from_url(
             Config.REDIS_URL
@@ -22,7 +43,7 @@ class TokenBlocklistClient:
 
     async def connect(self) -> None:
         """
-        Attempt a Redis PING to ensure connectivity.
+        Attempt a Redis PING to ensure connectivity, then start listening for revocations.
         """
         try:
             pong = await self.redis.ping()
@@ -32,11 +53,41 @@ class TokenBlocklistClient:
             logger.exception("Failed to connect to Redis: %s", e)
             raise
 
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen_for_revocations())
+
+    async def _listen_for_revocations(self) -> None:
+        """
+        Mark JTIs revoked by any worker as blocked in the local cache.
+        """
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        jti = message["data"]
+                        jti = jti.decode() if isinstance(jti, bytes) else jti
+                        self.local_cache.set(jti, True, ttl=self.expiry)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Messages may have been missed while disconnected; drop what we know.
+                logger.warning("Blocklist subscription lost, clearing local cache: %s", e)
+                self.local_cache.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
     async def add_jti_to_blocklist(self, jti: str) -> None:
         """
-        Block a token JTI by storing it in Redis with an expiry.
+        Block a token JTI by storing it in Redis with an expiry and notifying other workers.
         """
-        result = await self.redis.set(name=jti, value="", ex=self.expiry)
+        with REDIS_COMMAND_SECONDS.labels("set").time():
+            result = await self.redis.set(name=jti, value="", ex=self.expiry)
+        self.local_cache.set(jti, True, ttl=self.expiry)
+        with REDIS_COMMAND_SECONDS.labels("publish").time():
+            await self.redis.publish(self.channel, jti)
         logger.info("SET JTI '%s': result=%s", jti, result)
         logger.debug("Added JTI '%s' to blocklist with expiry %s seconds.", jti, self.expiry)
 
@@ -45,17 +96,231 @@ class TokenBlocklistClient:
         Check if a token JTI exists in Redis. If it does,
         we consider the token blocked/revoked.
         """
-        result = await self.redis.get(jti)
+        cached = self.local_cache.get(jti)
+        if cached is not None:
+            BLOCKLIST_LOCAL_HITS.inc()
+            return cached
+
+        BLOCKLIST_LOCAL_MISSES.inc()
+        with REDIS_COMMAND_SECONDS.labels("get").time():
+            result = await self.redis.get(jti)
         logger.debug("GET JTI '%s': returned=%s", jti, result)
-        return result is not None
+        blocked = result is not None
+        self.local_cache.set(jti, blocked, ttl=self.expiry if blocked else self.local_ttl)
+        return blocked
 
     async def close(self) -> None:
         """
-        Close the Redis connection gracefully.
+        Stop the revocation listener and close the Redis connection gracefully.
         """
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
         await self.redis.close()
         logger.info("Redis connection closed.")
 
 
-# Instantiate the client
+class BookCacheClient:
+    """
+    A read-through cache for rendered book detail JSON, stored in the same Redis.
+    Redis failures are logged and treated as misses so the database stays the source of truth.
+    Hits and misses are exported as Prometheus counters.
+
+    Each book also has a version stamp in Redis, bumped by invalidate() on every write, which
+    the book's ETag is derived from: revalidating or serving a cached copy needs no database query.
+    Stamps are only created for books that were loaded or written, never on a lookup.
+    """
+
+    def __init__(self, expiry: int = Config.BOOK_CACHE_TTL, prefix: str = "book:detail:",
+                 version_prefix: str = "book:version:", version_expiry: int = 86400):
+        """
+        :param expiry: Time-to-live in seconds for each cached payload.
+        :param prefix: Key prefix that namespaces book entries.
+        :param version_prefix: Key prefix that namespaces book version stamps.
+        :param version_expiry: Time-to-live in seconds for a version stamp (it is recreated
+            with a new value on the next load, which only costs clients one full response).
+        """
+        self.expiry = expiry
+        self.prefix = prefix
+        self.version_prefix = version_prefix
+        self.version_expiry = version_expiry
+        self.redis = redis.from_url(
+            Config.REDIS_URL
+        )
+
+    @staticmethod
+    def _normalize(book_uid) -> str:
+        # Normalize so that /books/{UID} in any casing maps to the keys invalidated on writes.
+        try:
+            return str(uuid.UUID(str(book_uid)))
+        except ValueError:
+            return str(book_uid)
+
+    def _key(self, book_uid) -> str:
+        return f"{self.prefix}{self._normalize(book_uid)}"
+
+    def _version_key(self, book_uid) -> str:
+        return f"{self.version_prefix}{self._normalize(book_uid)}"
+
+    async def _start_version(self, key: str) -> None:
+        # Start from a time-based epoch rather than 0 (as for the tag list), so a stamp that
+        # expired or was flushed never comes back with a value some client still holds.
+        await self.redis.set(key, int(time.time() * 1000), nx=True, ex=self.version_expiry)
+
+    async def version(self, book_uid) -> int | None:
+        """
+        Return the book's current version stamp, or None if it has none yet (or Redis is
+        unavailable); callers then skip conditional handling and caching. Stamps are only
+        created for books known to exist, see start_version().
+        """
+        try:
+            value = await self.redis.get(self._version_key(book_uid))
+        except RedisError as e:
+            logger.warning("Book version lookup failed for '%s': %s", book_uid, e)
+            return None
+
+        return int(value) if value is not None else None
+
+    async def start_version(self, book_uid) -> None:
+        """
+        Give a book that was just loaded from the database a version stamp, if it has none,
+        so that later reads can be cached and revalidated.
+        """
+        try:
+            await self._start_version(self._version_key(book_uid))
+        except RedisError as e:
+            logger.warning("Book version start failed for '%s': %s", book_uid, e)
+
+    async def get(self, book_uid) -> bytes | None:
+        """
+        Return the cached payload for a book, or None on a miss.
+        """
+        try:
+            payload = await self.redis.get(self._key(book_uid))
+        except RedisError as e:
+            logger.warning("Book cache GET failed for '%s': %s", book_uid, e)
+            payload = None
+
+        if payload is None:
+            BOOK_CACHE_MISSES.inc()
+        else:
+            BOOK_CACHE_HITS.inc()
+        return payload
+
+    async def set(self, book_uid, payload: bytes) -> None:
+        """
+        Store a rendered payload for a book with the configured expiry.
+        """
+        try:
+            await self.redis.set(name=self._key(book_uid), value=payload, ex=self.expiry)
+        except RedisError as e:
+            logger.warning("Book cache SET failed for '%s': %s", book_uid, e)
+
+    async def invalidate(self, book_uid) -> None:
+        """
+        Bump the book's version and drop its cached payload after it (or one of its children)
+        changed. Call it after the write is committed.
+        """
+        try:
+            key = self._version_key(book_uid)
+            await self._start_version(key)
+            await self.redis.incr(key)
+            await self.redis.delete(self._key(book_uid))
+            logger.debug("Invalidated cached book '%s'.", book_uid)
+        except RedisError as e:
+            logger.warning("Book cache DELETE failed for '%s': %s", book_uid, e)
+
+    async def forget(self, book_uid) -> None:
+        """
+        Drop a deleted book's version stamp and cached payload, so it gets no ETag (and
+        If-None-Match: * no 304) once it is gone.
+        """
+        try:
+            await self.redis.delete(self._version_key(book_uid), self._key(book_uid))
+            logger.debug("Forgot cached book '%s'.", book_uid)
+        except RedisError as e:
+            logger.warning("Book cache DELETE failed for '%s': %s", book_uid, e)
+
+    async def close(self) -> None:
+        """
+        Close the Redis connection gracefully.
+        """
+        await self.redis.close()
+
+
+class TagListCacheClient:
+    """
+    Caches the rendered tag list in process memory, keyed by a version stamp kept in Redis.
+
+    Every tag write bumps the stamp, so each worker notices on its next read that its copy
+    is stale; readers only pay for one Redis GET while the tag vocabulary is unchanged.
+    The stamp doubles as the list's ETag. Hits and misses are exported as Prometheus counters.
+    """
+
+    def __init__(self, key: str = "tags:version"):
+        """
+        :param key: Redis key holding the version stamp.
+        """
+        self.key = key
+        self._cached: tuple[int, bytes] | None = None
+        self.redis = redis.from_url(
+            Config.REDIS_URL
+        )
+
+    async def version(self) -> int | None:
+        """
+        Return the current version stamp, or None if Redis is unavailable (callers
+        then skip caching entirely).
+        """
+        try:
+            value = await self.redis.get(self.key)
+            if value is None:
+                # Start from a time-based epoch rather than 0, so a Redis flush can never
+                # bring back a version some worker still holds a copy for.
+                await self.redis.set(self.key, int(time.time() * 1000), nx=True)
+                value = await self.redis.get(self.key)
+        except RedisError as e:
+            logger.warning("Tag list version lookup failed: %s", e)
+            return None
+
+        return int(value) if value is not None else None
+
+    async def bump(self) -> None:
+        """
+        Mark every cached copy of the tag list as stale after a tag write.
+        """
+        self._cached = None
+        try:
+            await self.redis.incr(self.key)
+        except RedisError as e:
+            logger.warning("Tag list version bump failed: %s", e)
+
+    def get(self, version: int) -> bytes | None:
+        """
+        Return the locally cached payload if it was rendered for this version.
+        """
+        if self._cached is not None and self._cached[0] == version:
+            TAG_LIST_CACHE_HITS.inc()
+            return self._cached[1]
+
+        TAG_LIST_CACHE_MISSES.inc()
+        return None
+
+    def set(self, version: int, payload: bytes) -> None:
+        self._cached = (version, payload)
+
+    async def close(self) -> None:
+        """
+        Close the Redis connection gracefully.
+        """
+        await self.redis.close()
+
+
+# Instantiate the clients
 token_blocklist_client = TokenBlocklistClient()
+book_cache_client = BookCacheClient()
+tag_list_cache_client = TagListCacheClient()
@@ -0,0 +1,22 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+def dialect_insert(session: AsyncSession):
+    """
+    Return the insert() construct for the database behind the session, so callers can use
+    on_conflict_do_nothing / on_conflict_do_update. Production runs on PostgreSQL; the test
+    suite runs on SQLite, which supports the same ON CONFLICT clauses.
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        return sqlite.insert
+
+    return postgresql.insert
+
+
+def escape_like(value: str, escape: str = "\\") -> str:
+    """
+    Escape LIKE/ILIKE wildcards in user input so it is matched literally;
+    pass the same escape character to like()/ilike().
+    """
+    return value.replace(escape, escape * 2).replace("%", escape + "%").replace("_", escape + "_")
@@ -0,0 +1,42 @@
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the values that identify a representation's version.
+    """
+    digest = hashlib.blake2b(":".join(str(part) for part in parts).encode(), digest_size=16)
+
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match header covers the given ETag.
+    If-None-Match uses weak comparison, so a W/ prefix on the client's tag is ignored.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    candidates = (candidate.strip() for candidate in header.split(","))
+    return etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def not_modified(etag: str, cache_control: str = "no-cache") -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def json_response(payload: bytes, etag: str | None = None, cache_control: str = "no-cache") -> Response:
+    """
+    Send pre-rendered JSON, with the ETag clients should revalidate against.
+    """
+    headers = {"Cache-Control": cache_control}
+    if etag is not None:
+        headers["ETag"] = etag
+
+    return Response(content=payload, media_type="application/json", headers=headers)
@@ -0,0 +1,150 @@
+import os
+import time
+
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to a directory shared by all of
+# them (and empty it on deploy); every worker then writes its samples to mmap'd files there
+# and a scrape of any one worker reports the totals.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "bookly_http_request_duration_seconds",
+    "Time spent handling HTTP requests.",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "bookly_http_requests_in_progress",
+    "HTTP requests currently being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_CHECKOUT_SECONDS = Histogram(
+    "bookly_db_pool_checkout_duration_seconds",
+    "Time sessions waited for a connection from the database pool.",
+    ["pool"],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "bookly_db_pool_checked_out",
+    "Database connections currently checked out of the pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+REDIS_COMMAND_SECONDS = Histogram(
+    "bookly_redis_command_duration_seconds",
+    "Latency of Redis commands issued by the token blocklist.",
+    ["command"],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "bookly_db_queries_per_request",
+    "SQL statements executed while handling one HTTP request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+BLOCKLIST_LOCAL_HITS = Counter(
+    "bookly_token_blocklist_local_hits_total",
+    "Token blocklist lookups answered from the in-process cache.",
+)
+BLOCKLIST_LOCAL_MISSES = Counter(
+    "bookly_token_blocklist_local_misses_total",
+    "Token blocklist lookups that had to ask Redis.",
+)
+BOOK_CACHE_HITS = Counter(
+    "bookly_book_cache_hits_total",
+    "Book detail lookups served from the Redis cache.",
+)
+BOOK_CACHE_MISSES = Counter(
+    "bookly_book_cache_misses_total",
+    "Book detail lookups that missed the Redis cache (including Redis errors).",
+)
+TAG_LIST_CACHE_HITS = Counter(
+    "bookly_tag_list_cache_hits_total",
+    "Tag list requests served from the in-process copy.",
+)
+TAG_LIST_CACHE_MISSES = Counter(
+    "bookly_tag_list_cache_misses_total",
+    "Tag list requests that had to render the list from the database.",
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "bookly_password_hash_queue_depth",
+    "bcrypt jobs waiting for a password hash worker.",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "bookly_password_hash_in_flight",
+    "bcrypt jobs currently running on the password hash pool.",
+    multiprocess_mode="livesum",
+)
+CELERY_ENQUEUE_SECONDS = Histogram(
+    "bookly_celery_enqueue_duration_seconds",
+    "Time spent handing a task to the Celery broker.",
+    ["task"],
+)
+
+
+class MetricsMiddleware:
+    """
+    Records latency per route template (not raw path, to keep label cardinality bounded),
+    method and status, plus the number of requests in flight.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            # The router stores the matched route in the scope it was handed.
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                method, route.path if route is not None else "unmatched", str(status_code)
+            ).observe(time.perf_counter() - start)
+
+
+def metrics_registry() -> CollectorRegistry:
+    if not MULTIPROCESS:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    # Sync on purpose: in multiprocess mode collecting reads every worker's files from disk.
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
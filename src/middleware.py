@@ -1,31 +1,125 @@
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
 from fastapi import FastAPI
-from fastapi.requests import Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-import time
-import logging
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import Config
+from src.db.instrumentation import QueryStatsMiddleware
+from src.metrics import MetricsMiddleware
 
 logger = logging.getLogger('uvicorn.access')
 logger.disabled = True
 
+access_logger = logging.getLogger("bookly.access")
+access_logger.setLevel(logging.INFO)
+access_logger.propagate = False
+
+_access_queue: queue.SimpleQueue = queue.SimpleQueue()
+_access_listener: QueueListener | None = None
+
+
+class JsonAccessFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat()}
+        entry.update(record.msg)
+
+        return json.dumps(entry, separators=(",", ":"))
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Hand records to the listener as they are. The stock QueueHandler formats the message
+    before enqueueing, which would put the JSON encoding back on the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_access_handler = _DeferredQueueHandler(_access_queue)
 
-def register_middleware(app: FastAPI):
-    @app.middleware('http')
-    async def custom_logging(request: Request, call_next):
-        start_time = time.time()
 
-        response = await call_next(request)
-        processing_time = time.time() - start_time
+def start_access_log(stream=None) -> None:
+    """
+    Attach the access logger to a background thread that formats and writes the records.
+    Until this is called, AccessLogMiddleware passes requests straight through; the app's
+    lifespan starts it, so importing the app (tests, Alembic, Celery, scripts) does not.
+    """
+    global _access_listener
+    if _access_listener is not None:
+        return
 
-        message = (
-            f"{request.client.host}:{request.client.port} -  {request.method} - {request.url.path} -"
-            f" {response.status_code} completed after {processing_time:.4f}"
-            f" seconds")
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonAccessFormatter())
+    _access_listener = QueueListener(_access_queue, output)
+    _access_listener.start()
+    access_logger.addHandler(_access_handler)
 
-        print(message)
 
-        return response
+def stop_access_log() -> None:
+    """
+    Detach the access logger and flush whatever is still queued.
+    """
+    global _access_listener
+    if _access_listener is None:
+        return
 
+    access_logger.removeHandler(_access_handler)
+    _access_listener.stop()
+    _access_listener = None
+
+
+class AccessLogMiddleware:
+    """
+    One JSON line per HTTP request, written off the event loop.
+
+    Plain ASGI rather than @app.middleware('http'): it only watches the response start
+    message for the status code and never wraps the body. Successful requests are sampled
+    at sample_rate; errors (5xx) are always logged.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not access_logger.handlers:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if status_code >= 500 or self.sample_rate >= 1.0 or random.random() < self.sample_rate:
+                client = scope.get("client")
+                access_logger.info({
+                    "client": f"{client[0]}:{client[1]}" if client else None,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter_ns() - start) / 1_000_000, 3),
+                })
+
+
+def register_middleware(app: FastAPI):
     app.add_middleware(
         CORSMiddleware,  # type: ignore
         allow_origins=["*"],
@@ -38,3 +132,12 @@ def register_middleware(app: FastAPI):
         TrustedHostMiddleware,  # type: ignore
         allowed_hosts=["localhost", "127.0.0.1", "0.0.0.0", "testserver"],
     )
+
+    app.add_middleware(QueryStatsMiddleware)  # type: ignore
+    app.add_middleware(MetricsMiddleware)  # type: ignore
+
+    # Added last so it is outermost and also times requests rejected by the middleware above.
+    app.add_middleware(
+        AccessLogMiddleware,  # type: ignore
+        sample_rate=Config.ACCESS_LOG_SAMPLE_RATE,
+    )
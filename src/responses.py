@@ -0,0 +1,18 @@
+from typing import Any
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+
+def fast_json_response(adapter: TypeAdapter, content: Any, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Validate ORM objects straight into the response schema and serialize them to JSON in
+    one pass inside pydantic-core.
+
+    Returning the objects and letting FastAPI apply response_model instead validates them,
+    dumps the result back to Python dicts and then JSON-encodes those with the stdlib
+    encoder. The output is the same; routes keep response_model for the OpenAPI schema.
+    """
+    payload = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+    return Response(content=payload, media_type="application/json", status_code=status_code)
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, status
+import uuid
+
+from fastapi import APIRouter, Depends, Request, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 from src.db.models import User
-from src.db.main import get_session
+from src.db.main import get_session, get_read_session
 from src.auth.dependencies import get_current_user, RoleChecker
-from .schemas import ReviewCreateModel
+from src.errors import ReviewNotFound
+from src.http_cache import etag_matches, json_response, make_etag, not_modified
+from .schemas import ReviewCreateModel, ReviewModel
 from .service import ReviewService
 
 review_service = ReviewService()
@@ -14,18 +18,26 @@ user_role_checker = Depends(RoleChecker(["user", "admin"]))
 
 
 @review_router.get("/", dependencies=[admin_role_checker])
-async def get_all_reviews(session: AsyncSession = Depends(get_session)):
+async def get_all_reviews(session: AsyncSession = Depends(get_read_session)):
     books = await review_service.get_all_reviews(session)
 
     return books
 
 
-@review_router.get("/{review_uid}", dependencies=[user_role_checker])
-async def get_review(review_uid: str, session: AsyncSession = Depends(get_session)):
-    book = await review_service.get_review(review_uid, session)
+@review_router.get("/{review_uid}", response_model=ReviewModel, dependencies=[user_role_checker])
+async def get_review(review_uid: uuid.UUID, request: Request, session: AsyncSession = Depends(get_session)):
+    review = await review_service.get_review(review_uid, session)
+
+    if not review:
+        raise ReviewNotFound()
+
+    etag = make_etag("review", review.uid, review.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    payload = ReviewModel.model_validate(review, from_attributes=True).model_dump_json().encode()
 
-    if not book:
-        raise
+    return json_response(payload, etag)
 
 
 @review_router.post("/book/{book_uid}", dependencies=[user_role_checker])
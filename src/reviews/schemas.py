@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 import uuid
 
 from pydantic import BaseModel, Field
@@ -18,3 +18,9 @@ class ReviewModel(BaseModel):
 class ReviewCreateModel(BaseModel):
     rating: int = Field(lt=5)
     review_text: str
+
+
+class ReviewStatsModel(BaseModel):
+    review_count: int
+    average_rating: Optional[float]
+    rating_histogram: Dict[str, int]
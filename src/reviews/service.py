@@ -7,11 +7,23 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from .schemas import ReviewCreateModel
 from src.auth.service import UserService
 from src.books.service import BookService
-from src.db.models import Review
+from src.db.models import BookReviewStats, Review
+from src.db.redis import book_cache_client
+from src.db.utils import dialect_insert
 
 book_service = BookService()
 user_service = UserService()
 
+REVIEW_COLUMNS = (
+    Review.uid,
+    Review.rating,
+    Review.review_text,
+    Review.user_uid,
+    Review.book_uid,
+    Review.created_at,
+    Review.updated_at,
+)
+
 
 class ReviewService:
     async def add_review_to_book(
@@ -41,8 +53,12 @@ class ReviewService:
 
             session.add(new_review)
 
+            await self.update_review_stats(book.uid, new_review.rating, 1, session)
+
             await session.commit()
 
+            await book_cache_client.invalidate(book_uid)
+
             return new_review
 
         except Exception as e:
@@ -52,6 +68,44 @@ class ReviewService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    async def update_review_stats(self, book_uid, rating: int, delta: int, session: AsyncSession):
+        """
+        Add (delta=1) or remove (delta=-1) one review with the given rating from the
+        book's review aggregates, as part of the caller's transaction.
+
+        The stats row is created on first use and then locked with SELECT ... FOR UPDATE,
+        so concurrent reviews of the same book apply their changes one after another.
+        """
+        if book_uid is None:
+            return
+
+        insert = dialect_insert(session)
+        await session.exec(
+            insert(BookReviewStats)
+            .values(book_uid=book_uid, review_count=0, rating_sum=0, rating_histogram={})
+            .on_conflict_do_nothing(index_elements=["book_uid"])
+        )
+
+        statement = (
+            select(BookReviewStats)
+            .where(BookReviewStats.book_uid == book_uid)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        stats = (await session.exec(statement)).one()
+
+        histogram = dict(stats.rating_histogram)
+        key = str(rating)
+        histogram[key] = histogram.get(key, 0) + delta
+        if histogram[key] <= 0:
+            del histogram[key]
+
+        stats.review_count = max(stats.review_count + delta, 0)
+        stats.rating_sum = stats.rating_sum + delta * rating if stats.review_count else 0
+        stats.average_rating = stats.rating_sum / stats.review_count if stats.review_count else None
+        stats.rating_histogram = histogram
+        session.add(stats)
+
     async def get_review(self, review_uid: str, session: AsyncSession):
         statement = select(Review).where(Review.uid == review_uid)
 
@@ -60,11 +114,12 @@ class ReviewService:
         return result.first()
 
     async def get_all_reviews(self, session: AsyncSession):
-        statement = select(Review).order_by(desc(Review.created_at))
+        """All reviews, newest first, as plain dicts of their columns (no ORM instances)"""
+        statement = select(*REVIEW_COLUMNS).order_by(desc(Review.created_at))
 
         result = await session.exec(statement)
 
-        return result.all()
+        return [row._asdict() for row in result.all()]
 
     async def delete_review_to_from_book(
             self, review_uid: str, user_email: str, session: AsyncSession
@@ -73,12 +128,16 @@ class ReviewService:
 
         review = await self.get_review(review_uid, session)
 
-        if not review or (review.user != user):
+        if not review or user is None or review.user_uid != user.uid:
             raise HTTPException(
                 detail="Cannot delete this review",
                 status_code=status.HTTP_403_FORBIDDEN,
             )
 
-        session.delete(review)
+        await session.delete(review)
+
+        await self.update_review_stats(review.book_uid, review.rating, -1, session)
 
         await session.commit()
+
+        await book_cache_client.invalidate(review.book_uid)
@@ -1,14 +1,16 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.auth.dependencies import RoleChecker
 from src.books.schemas import Book
-from src.db.main import get_session
+from src.config import Config
+from src.db.main import get_session, get_read_session
+from src.http_cache import etag_matches, json_response, make_etag, not_modified
 
-from .schemas import TagAddModel, TagCreateModel, TagModel
-from .service import TagService
+from .schemas import TagAddModel, TagCreateModel, TagModel, TagSuggestion
+from .service import TagService, DEFAULT_SUGGESTIONS, MAX_SUGGESTIONS, MIN_SUGGEST_LENGTH
 
 tags_router = APIRouter()
 tag_service = TagService()
@@ -16,10 +18,32 @@ user_role_checker = Depends(RoleChecker(["user", "admin"]))
 
 
 @tags_router.get("/", response_model=List[TagModel], dependencies=[user_role_checker])
-async def get_all_tags(session: AsyncSession = Depends(get_session)):
-    tags = await tag_service.get_tags(session)
+async def get_all_tags(request: Request, session: AsyncSession = Depends(get_session)):
+    # Misses read from the primary: the list is cached under the current version stamp,
+    # and a copy loaded from a lagging replica would stay pinned until the next tag write.
+    version = await tag_service.get_tags_version()
+    etag = make_etag("tags", version) if version is not None else None
 
-    return tags
+    if etag is not None and etag_matches(request, etag):
+        return not_modified(etag)
+
+    payload = await tag_service.get_tags_json(session, version)
+
+    return json_response(payload, etag)
+
+
+@tags_router.get("/suggest", response_model=List[TagSuggestion], dependencies=[user_role_checker])
+async def suggest_tags(
+        response: Response,
+        q: str = Query(min_length=MIN_SUGGEST_LENGTH, max_length=100),
+        limit: int = Query(default=DEFAULT_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS),
+        session: AsyncSession = Depends(get_read_session),
+):
+    # Typeahead fires on every keystroke; let the browser reuse answers for a short while.
+    response.headers["Cache-Control"] = f"private, max-age={Config.SUGGEST_CACHE_MAX_AGE}"
+    suggestions = await tag_service.suggest_tags(q, session, limit=limit)
+
+    return suggestions
 
 
 @tags_router.post(
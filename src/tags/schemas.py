@@ -11,6 +11,11 @@ class TagModel(BaseModel):
     created_at: datetime
 
 
+class TagSuggestion(BaseModel):
+    uid: uuid.UUID
+    name: str
+
+
 class TagCreateModel(BaseModel):
     name: str
 
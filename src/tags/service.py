@@ -1,16 +1,31 @@
+import uuid
+
 from fastapi import status
 from fastapi.exceptions import HTTPException
+from pydantic import TypeAdapter
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func
 from sqlmodel import desc, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.books.service import BookService
-from src.db.models import Tag
+from src.books.service import BOOK_OPTIONS, BookService
+from src.db.models import BookTag, Tag
+from src.db.redis import book_cache_client, tag_list_cache_client
+from src.db.utils import dialect_insert, escape_like
 
-from .schemas import TagAddModel, TagCreateModel
+from .schemas import TagAddModel, TagCreateModel, TagModel
 from src.errors import BookNotFound, TagNotFound, TagAlreadyExists
 
 book_service = BookService()
 
+# pg_trgm extracts no full trigram from one or two characters, so shorter input would turn
+# the trigram index lookup into a scan of the whole index.
+MIN_SUGGEST_LENGTH = 3
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 25
+
+tag_list_adapter = TypeAdapter(list[TagModel])
+
 server_error = HTTPException(
     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Something went wrong"
 )
@@ -27,29 +42,109 @@ class TagService:
 
         return result.all()
 
+    async def get_tags_version(self) -> int | None:
+        """Current version stamp of the tag list, None if it cannot be determined"""
+
+        return await tag_list_cache_client.version()
+
+    async def get_tags_json(self, session: AsyncSession, version: int | None) -> bytes:
+        """
+        The rendered tag list, served from the in-process cache while the version stamp
+        is unchanged. Read the version before calling this, so a write committed in
+        between can only make the cached copy newer than its stamp, never older.
+        """
+
+        if version is not None:
+            payload = tag_list_cache_client.get(version)
+            if payload is not None:
+                return payload
+
+        tags = await self.get_tags(session)
+        payload = tag_list_adapter.dump_json(tag_list_adapter.validate_python(tags, from_attributes=True))
+
+        if version is not None:
+            tag_list_cache_client.set(version, payload)
+
+        return payload
+
+    async def suggest_tags(self, q: str, session: AsyncSession, limit: int = DEFAULT_SUGGESTIONS):
+        """Typeahead over tag names, served by the pg_trgm GIN index on tags.name"""
+
+        statement = (
+            select(Tag.uid, Tag.name)
+            .where(Tag.name.ilike(f"%{escape_like(q)}%", escape="\\"))
+            .order_by(desc(func.similarity(Tag.name, q)), Tag.name)
+            .limit(limit)
+        )
+
+        result = await session.exec(statement)
+
+        return [{"uid": uid, "name": name} for uid, name in result.all()]
+
     async def add_tags_to_book(
             self, book_uid: str, tag_data: TagAddModel, session: AsyncSession
     ):
         """Add tags to a book"""
 
-        book = await book_service.get_book_by_id(book_uid=book_uid, session=session)
+        book = await book_service.get_book_by_id(book_uid=book_uid, session=session, options=BOOK_OPTIONS)
 
         if not book:
             raise BookNotFound()
 
-        for tag_item in tag_data.tags:
-            result = await session.exec(select(Tag).where(Tag.name == tag_item.name))
+        # Deduplicate while keeping the payload order.
+        names = list(dict.fromkeys(tag_item.name for tag_item in tag_data.tags))
 
-            tag = result.one_or_none()
-            if not tag:
-                tag = Tag(name=tag_item.name)
+        created = False
+        if names:
+            tag_uids, created = await self.resolve_tag_uids(names, session)
+
+            insert = dialect_insert(session)
+            await session.exec(
+                insert(BookTag)
+                .values([{"book_id": book.uid, "tag_id": tag_uid} for tag_uid in tag_uids])
+                .on_conflict_do_nothing(index_elements=["book_id", "tag_id"])
+            )
 
-            book.tags.append(tag)
-        session.add(book)
         await session.commit()
+        await book_cache_client.invalidate(book_uid)
+        if created:
+            await tag_list_cache_client.bump()
         await session.refresh(book)
         return book
 
+    async def resolve_tag_uids(self, names: list[str], session: AsyncSession) -> tuple[list[uuid.UUID], bool]:
+        """
+        Map tag names to tag uids, creating the missing tags, in at most three statements.
+        Also returns whether any tag was created.
+        Safe against concurrent callers creating the same names: the unique index on tags.name
+        makes the insert skip them, and they are picked up by a second lookup.
+        """
+
+        result = await session.exec(select(Tag.name, Tag.uid).where(Tag.name.in_(names)))
+        uids = dict(result.all())
+
+        created = False
+        missing = [name for name in names if name not in uids]
+        if missing:
+            insert = dialect_insert(session)
+            result = await session.exec(
+                insert(Tag)
+                .values([{"uid": uuid.uuid4(), "name": name} for name in missing])
+                .on_conflict_do_nothing(index_elements=["name"])
+                .returning(Tag.name, Tag.uid)
+            )
+            inserted = result.all()
+            uids.update(inserted)
+            created = bool(inserted)
+
+            # Names another transaction inserted between our lookup and our insert.
+            raced = [name for name in missing if name not in uids]
+            if raced:
+                result = await session.exec(select(Tag.name, Tag.uid).where(Tag.name.in_(raced)))
+                uids.update(result.all())
+
+        return [uids[name] for name in names], created
+
     async def get_tag_by_uid(self, tag_uid: str, session: AsyncSession):
         """Get tag by uid"""
 
@@ -74,7 +169,14 @@ class TagService:
 
         session.add(new_tag)
 
-        await session.commit()
+        try:
+            await session.commit()
+        except IntegrityError:
+            # Lost a race with a concurrent request creating the same name.
+            await session.rollback()
+            raise TagAlreadyExists()
+
+        await tag_list_cache_client.bump()
 
         return new_tag
 
@@ -86,16 +188,25 @@ class TagService:
         tag = await self.get_tag_by_uid(tag_uid, session)
 
         if not tag:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+            raise TagNotFound()
 
         update_data_dict = tag_update_data.model_dump()
 
         for k, v in update_data_dict.items():
             setattr(tag, k, v)
 
+        book_uids = await self._tagged_book_uids(tag.uid, session)
+
+        try:
             await session.commit()
+        except IntegrityError:
+            # Renamed to a name another tag already has.
+            await session.rollback()
+            raise TagAlreadyExists()
 
-            await session.refresh(tag)
+        await self._tag_changed(book_uids)
+
+        await session.refresh(tag)
 
         return tag
 
@@ -107,6 +218,26 @@ class TagService:
         if not tag:
             raise TagNotFound()
 
+        book_uids = await self._tagged_book_uids(tag.uid, session)
+
+        # Deleting the tag also removes its booktag rows.
         await session.delete(tag)
 
         await session.commit()
+
+        await self._tag_changed(book_uids)
+
+    async def _tagged_book_uids(self, tag_uid, session: AsyncSession) -> list:
+        """Uids of the books carrying a tag, without loading the books themselves"""
+
+        result = await session.exec(select(BookTag.book_id).where(BookTag.tag_id == tag_uid))
+
+        return result.all()
+
+    async def _tag_changed(self, book_uids: list):
+        """Drop cached representations that embed a renamed or deleted tag"""
+
+        await tag_list_cache_client.bump()
+
+        for book_uid in book_uids:
+            await book_cache_client.invalidate(book_uid)
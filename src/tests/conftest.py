@@ -1,18 +1,23 @@
 # src/tests/conftest.py
 
 import os
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+
 import pytest
 import pytest_asyncio
 import httpx
 from sqlmodel import SQLModel, create_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
 from unittest.mock import patch, AsyncMock
 from httpx import ASGITransport
 
 from src import app
+from src.db.instrumentation import normalize_sql
 from .mocks.redis_mock import AsyncRedisMock
-from src.db.redis import token_blocklist_client
+from src.db.redis import token_blocklist_client, book_cache_client, tag_list_cache_client
 
 os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///:memory:"  # Force SQLite for tests
 
@@ -45,23 +50,94 @@ async def db_session(test_engine):
 
 @pytest.fixture
 def override_get_session(db_session):
-    from src.db.main import get_session
+    from src.db.main import get_session, get_read_session
     def _override():
         yield db_session
 
     app.dependency_overrides[get_session] = _override
+    app.dependency_overrides[get_read_session] = _override
     yield
     app.dependency_overrides.clear()
 
 
+@pytest_asyncio.fixture
+async def auth_headers(db_session):
+    """Authorization headers for a freshly created, verified user"""
+    from src.auth.utils import create_access_token
+    from src.tests.factories.user_factory import create_fake_user
+
+    user = create_fake_user(email=f"user_{uuid.uuid4().hex[:8]}@example.com", is_verified=True)
+    db_session.add(user)
+    await db_session.commit()
+    token = create_access_token({
+        "email": user.email, "user_uid": str(user.uid), "role": user.role, "is_verified": True
+    })
+    return {"Authorization": f"Bearer {token}"}
+
+
+class QueryCounter:
+    """Statements executed on the test engine, with helpers to collect and bound them"""
+
+    def __init__(self, session):
+        self.session = session
+        self.statements = []
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @contextmanager
+    def count(self):
+        """
+        Collect the statements the block runs into the yielded list, filled when the block exits.
+        The shared session is emptied first, so objects loaded while setting up cannot hide
+        relationship loads.
+        """
+        self.session.expunge_all()
+        executed = []
+        start = len(self.statements)
+        yield executed
+        executed.extend(self.statements[start:])
+
+    @contextmanager
+    def at_most(self, limit: int):
+        """Fail if the block runs more than `limit` statements"""
+        with self.count() as executed:
+            yield executed
+        if len(executed) > limit:
+            listing = "\n".join(f"  {normalize_sql(statement)}" for statement in executed)
+            pytest.fail(f"{len(executed)} queries executed, expected at most {limit}:\n{listing}")
+
+
+@pytest.fixture
+def query_counter(test_engine, db_session):
+    """
+    Count the SQL statements a request runs, to catch N+1 regressions:
+
+        with query_counter.at_most(3):
+            await async_client.get(...)
+
+        with query_counter.count() as executed:
+            await async_client.get(...)
+        assert len(executed) == ...
+    """
+    counter = QueryCounter(db_session)
+    event.listen(test_engine.sync_engine, "after_cursor_execute", counter.record)
+    yield counter
+    event.remove(test_engine.sync_engine, "after_cursor_execute", counter.record)
+
+
 @pytest.fixture(autouse=True)
 def mock_redis():
     """Mock Redis globally."""
     redis_mock = AsyncRedisMock()
     with patch('src.db.redis.token_blocklist_client.redis', redis_mock), \
+            patch('src.db.redis.book_cache_client.redis', redis_mock), \
+            patch('src.db.redis.tag_list_cache_client.redis', redis_mock), \
             patch('redis.asyncio.Redis', return_value=redis_mock), \
             patch('src.db.redis.redis.Redis', return_value=redis_mock):
         token_blocklist_client.redis = redis_mock
+        book_cache_client.redis = redis_mock
+        tag_list_cache_client.redis = redis_mock
         yield redis_mock
 
 
@@ -92,6 +168,30 @@ def run_celery_inline():
         yield mock_task
 
 
+@pytest.fixture
+def app_lifespan():
+    """
+    Run the app's startup and shutdown hooks around a block:
+
+        async with app_lifespan():
+            ...
+
+    The database steps (create_all, engine disposal) are skipped, so nothing touches whatever
+    DATABASE_URL the environment points at, and the shared password hash pool stays usable.
+    """
+    from src.auth.utils import password_hash_pool
+
+    @asynccontextmanager
+    async def run():
+        with patch("src.init_db", AsyncMock()), \
+                patch("src.async_engine", AsyncMock()), \
+                patch.object(password_hash_pool, "shutdown"):
+            async with app.router.lifespan_context(app):
+                yield
+
+    return run
+
+
 @pytest_asyncio.fixture
 async def async_client():
     transport = ASGITransport(app=app)
@@ -1,5 +1,6 @@
 # src/tests/integration/test_integration_auth.py
 
+import asyncio
 import pytest
 import uuid
 import re
@@ -134,6 +135,37 @@ async def test_logout(override_get_session, async_client, db_session):
     assert logout_response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_revocation_from_another_worker_reaches_running_app(override_get_session, async_client,
+                                                                   auth_headers, mock_redis, app_lifespan):
+    """The app's lifespan subscribes to revocations, so a locally cached "not revoked" is overridden"""
+    from src.auth.utils import decode_token
+    from src.db.redis import TokenBlocklistClient, token_blocklist_client
+
+    jti = decode_token(auth_headers["Authorization"].split()[1])["jti"]
+    other_worker = TokenBlocklistClient()
+    other_worker.redis = mock_redis
+
+    async with app_lifespan():
+        for _ in range(100):
+            if mock_redis.subscribers:
+                break
+            await asyncio.sleep(0)
+        assert mock_redis.subscribers, "no worker subscribed to revocations"
+
+        response = await async_client.get("/api/v1/auth/current-user", headers=auth_headers)
+        assert response.status_code == 200
+        assert token_blocklist_client.local_cache.get(jti) is False
+
+        await other_worker.add_jti_to_blocklist(jti)
+        await asyncio.sleep(0)
+
+        response = await async_client.get("/api/v1/auth/current-user", headers=auth_headers)
+        assert response.status_code == 401
+
+    assert not mock_redis.subscribers
+
+
 # -----------------------------
 # Password Reset Tests
 # -----------------------------
@@ -1,57 +1,60 @@
 # File: src/tests/integration/test_integration_batch.py
 
+import uuid
+
 import pytest
 import httpx
+from sqlmodel import select
+
+from src.db.models import Book
 
 
-@pytest.mark.anyio
-async def test_batch_create_books(async_client: httpx.AsyncClient):
-    signup_resp = await async_client.post("/auth/signup", json={
-        "first_name": "Batch",
-        "last_name": "User",
-        "username": "batch_user",
-        "email": "batch@example.com",
-        "password": "BatchPass123"
-    })
-    if signup_resp.status_code == 404:
-        return
-    if signup_resp.status_code not in [200, 201]:
-        return
-
-    login_resp = await async_client.post("/auth/login", json={
-        "email": "batch@example.com",
-        "password": "BatchPass123"
-    })
-    if login_resp.status_code not in [200, 201]:
-        return
-    data = login_resp.json()
-    token = data.get("access_token", None)
-    if not token:
-        return
-
-    headers = {"Authorization": f"Bearer {token}"}
-
-    # Example route => /books/batch not defined in the code, but let's keep the test
-    # Possibly your code doesn't have a batch route => we gracefully handle 404
-    books_payload = [
-        {
-            "title": f"Batch Book {i}",
-            "author": "BatchAuthor",
-            "publisher": "BatchPub",
-            "published_date": "2021-01-01",
-            "page_count": 100 + i,
-            "language": "EN"
-        } for i in range(2)
-    ]
-    books_payload.append({
-        "title": "Invalid Book",
-        "publisher": "NoAuthorPub",
+def _book(title: str) -> dict:
+    return {
+        "title": title,
+        "author": "BatchAuthor",
+        "publisher": "BatchPub",
         "published_date": "2021-01-01",
-        "page_count": 50,
+        "page_count": 120,
         "language": "EN"
-    })
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_create_books(override_get_session, async_client: httpx.AsyncClient, auth_headers, db_session):
+    invalid = _book("Invalid Book")
+    del invalid["author"]
+
+    resp = await async_client.post("/api/v1/books/batch", headers=auth_headers,
+                                   json=[_book("Batch Book"), invalid])
+
+    assert resp.status_code == 207
+    data = resp.json()
+    assert data["created"] == 1
+    assert data["failed"] == 1
+
+    created, failed = data["items"]
+    assert created["index"] == 0
+    assert created["status"] == 201
+    assert created["errors"] is None
+    assert failed["index"] == 1
+    assert failed["status"] == 422
+    assert failed["uid"] is None
+    assert [error["loc"] for error in failed["errors"]] == [["author"]]
+
+    book = (await db_session.exec(select(Book).where(Book.uid == uuid.UUID(created["uid"])))).one()
+    assert book.title == "Batch Book"
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_non_object_items(override_get_session, async_client: httpx.AsyncClient, auth_headers):
+    """An element that is not a JSON object fails on its own; the rest of the batch still goes in"""
+    resp = await async_client.post("/api/v1/books/batch", headers=auth_headers,
+                                   json=[42, _book("Batch Book"), "not a book"])
 
-    resp = await async_client.post("/books/batch", headers=headers, json=books_payload)
-    if resp.status_code == 404:
-        return
-    assert resp.status_code in [200, 207, 422]
+    assert resp.status_code == 207
+    data = resp.json()
+    assert data["created"] == 1
+    assert data["failed"] == 2
+    assert [item["status"] for item in data["items"]] == [422, 201, 422]
+    assert data["items"][0]["errors"][0]["type"] == "model_type"
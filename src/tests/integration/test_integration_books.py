@@ -1,8 +1,16 @@
 # File: src/tests/integration/test_integration_books.py
 
+import uuid
+
 import pytest
 import httpx
 
+from src.config import Config
+from src.db.redis import book_cache_client
+from src.books.service import BookService
+from src.reviews.service import ReviewService
+from src.tests.factories.book_factory import create_fake_book
+
 
 @pytest.mark.anyio
 async def test_create_and_get_book(async_client: httpx.AsyncClient):
@@ -52,3 +60,92 @@ async def test_create_and_get_book(async_client: httpx.AsyncClient):
     if del_resp.status_code == 404:
         return
     assert del_resp.status_code in [200, 204]
+
+
+@pytest.mark.asyncio
+async def test_get_book_conditional_get(override_get_session, async_client, auth_headers, db_session,
+                                        query_counter):
+    """GET /books/{uid} answers If-None-Match with 304 until the book changes, without touching the database"""
+    book = create_fake_book()
+    db_session.add(book)
+    await db_session.commit()
+    url = f"/api/v1/books/{book.uid}"
+
+    # The first load starts the book's version stamp, so only later responses carry an ETag.
+    unstamped = await async_client.get(url, headers=auth_headers)
+    assert unstamped.status_code == 200
+    assert "etag" not in unstamped.headers
+
+    first = await async_client.get(url, headers=auth_headers)
+    assert first.status_code == 200
+    assert first.json()["uid"] == str(book.uid)
+    etag = first.headers["etag"]
+
+    with query_counter.at_most(0):
+        unchanged = await async_client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        cached = await async_client.get(url, headers=auth_headers)
+    assert unchanged.status_code == 304
+    assert unchanged.headers["etag"] == etag
+    assert cached.content == first.content
+
+    await ReviewService().update_review_stats(book.uid, 4, 1, db_session)
+    await db_session.commit()
+    # As the review write paths do once the change is committed.
+    await book_cache_client.invalidate(book.uid)
+    # The test shares one session across requests; start from a clean identity map like a new request would.
+    db_session.expunge_all()
+
+    changed = await async_client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["review_stats"]["review_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_unknown_book_with_wildcard_etag(override_get_session, async_client, auth_headers, db_session,
+                                                   mock_redis):
+    """If-None-Match: * gets a 404 for a book that does not exist, or no longer does, and leaves no stamp behind"""
+    missing = await async_client.get(f"/api/v1/books/{uuid.uuid4()}", headers={**auth_headers, "If-None-Match": "*"})
+    assert missing.status_code == 404
+
+    book = create_fake_book()
+    db_session.add(book)
+    await db_session.commit()
+    url = f"/api/v1/books/{book.uid}"
+    await async_client.get(url, headers=auth_headers)
+    assert (await async_client.get(url, headers={**auth_headers, "If-None-Match": "*"})).status_code == 304
+
+    await BookService().delete_book(book.uid, db_session)
+    db_session.expunge_all()
+    deleted = await async_client.get(url, headers={**auth_headers, "If-None-Match": "*"})
+    assert deleted.status_code == 404
+    assert not [key for key in mock_redis.storage if key.startswith("book:")]
+
+
+@pytest.mark.asyncio
+async def test_fast_json_list_responses_match_default(override_get_session, async_client, auth_headers,
+                                                      db_session, monkeypatch):
+    """FAST_JSON_RESPONSES changes how list pages are rendered, not what they contain"""
+    owner_uid = uuid.uuid4()
+    db_session.add_all([create_fake_book(user_uid=owner_uid) for _ in range(3)])
+    await db_session.commit()
+
+    responses = {}
+    for fast in (False, True):
+        monkeypatch.setattr(Config, "FAST_JSON_RESPONSES", fast)
+        page = await async_client.get("/api/v1/books/?limit=5", headers=auth_headers)
+        user_books = await async_client.get(f"/api/v1/books/user/{owner_uid}", headers=auth_headers)
+        assert page.status_code == user_books.status_code == 200
+        responses[fast] = (page.json(), user_books.json())
+
+    assert responses[True] == responses[False]
+    assert len(responses[True][1]) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/v1/books/suggest", "/api/v1/tags/suggest"])
+async def test_suggest_rejects_input_too_short_for_trigrams(path, async_client, auth_headers):
+    """One or two characters yield no trigram, so typeahead only starts at the third"""
+    response = await async_client.get(path, params={"q": "ab"}, headers=auth_headers)
+
+    assert response.status_code == 422
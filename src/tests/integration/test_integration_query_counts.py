@@ -0,0 +1,75 @@
+# File: src/tests/integration/test_integration_query_counts.py
+
+import pytest
+
+from src.db.models import BookTag, Tag
+from src.tests.factories.book_factory import create_fake_book
+from src.tests.factories.review_factory import create_fake_review
+from src.tests.factories.user_factory import create_fake_user
+
+
+async def _seed_catalogue(db_session, books: int):
+    """A user's books, each with two reviews and two tags"""
+    owner = create_fake_user(is_verified=True)
+    reviewer = create_fake_user(is_verified=True)
+    db_session.add_all([owner, reviewer])
+    tags = [Tag(name=f"{owner.uid.hex[:8]}-{i}") for i in range(2)]
+    db_session.add_all(tags)
+    await db_session.flush()
+
+    created, reviews = [], []
+    for _ in range(books):
+        book = create_fake_book(user_uid=owner.uid)
+        db_session.add(book)
+        await db_session.flush()
+        reviews += [create_fake_review(user_uid=reviewer.uid, book_uid=book.uid) for _ in range(2)]
+        db_session.add_all(reviews[-2:])
+        db_session.add_all([BookTag(book_id=book.uid, tag_id=tag.uid) for tag in tags])
+        created.append(book)
+    await db_session.commit()
+
+    return owner, created, reviews
+
+
+async def _count(query_counter, client, url, headers) -> int:
+    with query_counter.count() as executed:
+        response = await client.get(url, headers=headers)
+    assert response.status_code == 200
+
+    return len(executed)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path, limit", [
+    ("/api/v1/books/{book}", 3),
+    ("/api/v1/books/?limit=50", 1),
+    ("/api/v1/books/user/{owner}", 1),
+    ("/api/v1/books/top-rated", 1),
+    ("/api/v1/tags/", 1),
+    ("/api/v1/reviews/{review}", 1),
+    ("/api/v1/auth/current-user", 3),
+])
+async def test_read_endpoint_query_budget(path, limit, override_get_session, async_client, auth_headers,
+                                          db_session, query_counter):
+    owner, books, reviews = await _seed_catalogue(db_session, 3)
+    url = path.format(book=books[0].uid, owner=owner.uid, review=reviews[0].uid)
+
+    with query_counter.at_most(limit):
+        response = await async_client.get(url, headers=auth_headers)
+
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/v1/books/?limit=50", "/api/v1/books/user/{owner}", "/api/v1/tags/"])
+async def test_list_query_count_does_not_grow_with_rows(path, override_get_session, async_client, auth_headers,
+                                                        db_session, query_counter, mock_redis):
+    """Relationship loads must be batched: the same number of statements for one book or ten"""
+    owner, _, _ = await _seed_catalogue(db_session, 1)
+    one = await _count(query_counter, async_client, path.format(owner=owner.uid), auth_headers)
+
+    owner, _, _ = await _seed_catalogue(db_session, 10)
+    mock_redis.storage.clear()
+    many = await _count(query_counter, async_client, path.format(owner=owner.uid), auth_headers)
+
+    assert many == one
@@ -1,8 +1,13 @@
 # File: src/tests/integration/test_integration_reviews.py
 
+import uuid
+
 import pytest
 import httpx
 
+from src.tests.factories.book_factory import create_fake_book
+from src.tests.factories.review_factory import create_fake_review
+
 
 @pytest.mark.anyio
 async def test_create_and_delete_review(async_client: httpx.AsyncClient):
@@ -58,3 +63,24 @@ async def test_create_and_delete_review(async_client: httpx.AsyncClient):
     del_resp = await async_client.delete(f"/reviews/{review_uid}", headers=headers)
     # Expect 204 or maybe 200, or 404 if logic differs
     assert del_resp.status_code in [200, 204, 404]
+
+
+@pytest.mark.asyncio
+async def test_get_review_conditional_get(override_get_session, async_client, auth_headers, db_session):
+    """GET /reviews/{uid} returns the review with an ETag, 304 on a match and 404 when missing"""
+    book = create_fake_book()
+    review = create_fake_review(book_uid=book.uid)
+    db_session.add_all([book, review])
+    await db_session.commit()
+    url = f"/api/v1/reviews/{review.uid}"
+
+    first = await async_client.get(url, headers=auth_headers)
+    assert first.status_code == 200
+    assert first.json()["review_text"] == review.review_text
+
+    unchanged = await async_client.get(url, headers={**auth_headers, "If-None-Match": first.headers["etag"]})
+    assert unchanged.status_code == 304
+
+    missing = await async_client.get(f"/api/v1/reviews/{uuid.uuid4()}", headers=auth_headers)
+    assert missing.status_code == 404
+    assert missing.json()["error_code"] == "review_not_found"
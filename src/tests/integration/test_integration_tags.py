@@ -1,5 +1,7 @@
 # File: src/tests/integration/test_integration_tags.py
 
+import uuid
+
 import pytest
 import httpx
 
@@ -103,3 +105,26 @@ async def test_add_tag_to_book(async_client: httpx.AsyncClient):
     assert add_tag_resp.status_code == 200
     book_with_tag = add_tag_resp.json()
     assert any(t["name"] == "Adventure" for t in book_with_tag["tags"])
+
+
+@pytest.mark.asyncio
+async def test_tag_list_conditional_get(override_get_session, async_client, auth_headers):
+    """The tag list carries an ETag, answers 304 while unchanged and changes after a write"""
+    headers = auth_headers
+
+    first = await async_client.get("/api/v1/tags/", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    unchanged = await async_client.get("/api/v1/tags/", headers={**headers, "If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    name = f"conditional_{uuid.uuid4().hex[:6]}"
+    created = await async_client.post("/api/v1/tags/", headers=headers, json={"name": name})
+    assert created.status_code == 201
+
+    changed = await async_client.get("/api/v1/tags/", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert name in {tag["name"] for tag in changed.json()}
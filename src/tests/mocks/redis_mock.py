@@ -1,23 +1,65 @@
+import asyncio
+
+
+class AsyncPubSubMock:
+    """Mock Redis pub/sub connection fed by AsyncRedisMock.publish"""
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.channels = set()
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, *channels):
+        self.channels.update(channels)
+        self.broker.subscribers.append(self)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        if self in self.broker.subscribers:
+            self.broker.subscribers.remove(self)
+
+
 class AsyncRedisMock:
     """Mock Redis client for testing"""
 
     def __init__(self):
         self.storage = {}
         self.is_connected = False
+        self.subscribers = []
 
     async def get(self, key):
         return self.storage.get(key)
 
-    async def set(self, name, value, ex=None):
-        self.storage[name] = value
+    async def set(self, name, value, ex=None, nx=False):
+        if nx and name in self.storage:
+            return None
+        self.storage[name] = str(value).encode() if isinstance(value, int) else value
         return True
 
+    async def incr(self, name):
+        value = int(self.storage.get(name, 0)) + 1
+        self.storage[name] = str(value).encode()
+        return value
+
     async def delete(self, *keys):
         for key in keys:
             if key in self.storage:
                 del self.storage[key]
         return True
 
+    async def publish(self, channel, message):
+        receivers = [sub for sub in self.subscribers if channel in sub.channels]
+        for sub in receivers:
+            data = message.encode() if isinstance(message, str) else message
+            sub.queue.put_nowait({"type": "message", "channel": channel.encode(), "data": data})
+        return len(receivers)
+
+    def pubsub(self, **kwargs):
+        return AsyncPubSubMock(self)
+
     async def ping(self):
         return True
 
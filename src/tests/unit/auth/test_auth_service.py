@@ -87,3 +87,22 @@ async def test_create_user():
     # Also check password hashing:
     assert new_user.password_hash != "Secret123"
     assert generate_passwd_hash("Secret123") != new_user.password_hash
+
+
+@pytest.mark.asyncio
+async def test_get_principal_by_email(db_session):
+    """
+    The principal lookup reads only the authorization columns of the user row.
+    """
+    service = UserService()
+    user = User(email="principal@example.com", username="princ", first_name="P", last_name="Q",
+                password_hash="fakehash", role="admin", is_verified=True)
+    db_session.add(user)
+    await db_session.commit()
+
+    principal = await service.get_principal_by_email("principal@example.com", db_session)
+    assert principal.uid == user.uid
+    assert principal.role == "admin"
+    assert principal.is_verified is True
+
+    assert await service.get_principal_by_email("nobody@example.com", db_session) is None
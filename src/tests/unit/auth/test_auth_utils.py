@@ -1,7 +1,15 @@
+import asyncio
+import threading
 from datetime import timedelta
+
+import pytest
+from prometheus_client import REGISTRY
 from src.auth.utils import (
+    PasswordHashPool,
     generate_passwd_hash,
+    generate_passwd_hash_async,
     verify_password,
+    verify_password_async,
     create_access_token,
     decode_token
 )
@@ -43,3 +51,39 @@ def test_decode_token_expired():
     token = create_access_token({"email": "test@example.com"}, expiry=timedelta(seconds=-1))
     decoded = decode_token(token)
     assert decoded is None
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_runs_on_pool():
+    hashed = await generate_passwd_hash_async("secret123")
+    assert hashed.startswith("$2b$")
+    assert await verify_password_async("secret123", hashed) is True
+    assert await verify_password_async("wrong", hashed) is False
+
+
+@pytest.mark.asyncio
+async def test_password_hash_pool_gauges():
+    pool = PasswordHashPool(max_workers=1)
+    queued = REGISTRY.get_sample_value("bookly_password_hash_queue_depth")
+    running = REGISTRY.get_sample_value("bookly_password_hash_in_flight")
+    release = threading.Event()
+    worker_threads = []
+
+    def blocking_job():
+        worker_threads.append(threading.current_thread().name)
+        release.wait(timeout=5)
+        return "done"
+
+    first = asyncio.ensure_future(pool.run(blocking_job))
+    second = asyncio.ensure_future(pool.run(blocking_job))
+    await asyncio.sleep(0.05)
+
+    assert REGISTRY.get_sample_value("bookly_password_hash_queue_depth") == queued + 1
+    assert REGISTRY.get_sample_value("bookly_password_hash_in_flight") == running + 1
+
+    release.set()
+    assert await asyncio.gather(first, second) == ["done", "done"]
+    assert REGISTRY.get_sample_value("bookly_password_hash_queue_depth") == queued
+    assert REGISTRY.get_sample_value("bookly_password_hash_in_flight") == running
+    assert all(name.startswith("passwd-hash") for name in worker_threads)
+    pool.shutdown()
@@ -0,0 +1,116 @@
+# File: src/tests/unit/books/test_books_importer.py
+
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.books.importer import (
+    MERGE_BOOKS,
+    MERGE_TAGS,
+    BookImporter,
+    ImportState,
+    book_uid_for,
+    build_records,
+    chunked,
+    detect_format,
+    read_rows,
+)
+
+VALID_ROW = {
+    "title": "Imported Book",
+    "author": "Some Author",
+    "publisher": "Some Publisher",
+    "published_date": "2020-05-01",
+    "page_count": "240",
+    "language": "English",
+}
+
+
+def test_read_rows_csv_and_ndjson(tmp_path):
+    csv_file = tmp_path / "books.csv"
+    csv_file.write_text("title,author,publisher,published_date,page_count,language,tags\n"
+                        "A,B,C,2020-01-01,10,EN,fiction|classic\n")
+    ndjson_file = tmp_path / "books.ndjson"
+    ndjson_file.write_text(json.dumps(VALID_ROW) + "\n\n{not json\n")
+
+    assert [(n, row["tags"]) for n, row in read_rows(csv_file, "csv")] == [(1, "fiction|classic")]
+    assert list(read_rows(ndjson_file, "ndjson")) == [(1, VALID_ROW), (3, None)]
+    assert detect_format(ndjson_file) == "ndjson"
+    with pytest.raises(ValueError):
+        detect_format(tmp_path / "books.xml")
+
+
+def test_build_records_validates_and_derives_uids():
+    rows = [
+        (1, {**VALID_ROW, "tags": "fiction| classic|fiction|"}),
+        (2, {**VALID_ROW, "page_count": "many"}),
+        (3, None),
+    ]
+
+    records, errors = build_records("feed", rows)
+
+    assert len(records) == 1
+    uid, *_, tags = records[0]
+    assert uid == book_uid_for("feed", 1)
+    assert tags == ["fiction", "classic"]
+    assert [row_number for row_number, _ in errors] == [2, 3]
+    assert errors[0][1][0]["loc"] == ("page_count",)
+
+    # Same source row, same uid: replaying a chunk cannot create duplicates.
+    assert build_records("feed", rows[:1])[0][0][0] == uid
+    assert book_uid_for("other-feed", 1) != uid
+
+
+def test_chunked():
+    assert [len(chunk) for chunk in chunked(iter(range(7)), 3)] == [3, 3, 1]
+
+
+def test_import_state_resumes_only_the_same_file(tmp_path):
+    source = tmp_path / "books.ndjson"
+    source.write_text("\n".join(json.dumps({**VALID_ROW, "title": f"Book {i}"}) for i in range(1, 6)) + "\n")
+    state_file = tmp_path / "books.ndjson.import-state"
+
+    state = ImportState.load(state_file, source)
+    state.rows_done = 3
+    state.save(state_file)
+
+    importer = BookImporter(source, "ndjson", "feed", None, 2, state_file)
+    resumed = ImportState.load(state_file, source)
+    assert [row["title"] for _, row in importer.pending_rows(resumed)] == ["Book 4", "Book 5"]
+
+    source.write_text(source.read_text() + json.dumps(VALID_ROW) + "\n")
+    assert ImportState.load(state_file, source).rows_done == 0
+
+
+class _FakeConnection:
+    """The slice of an asyncpg connection the importer uses, with canned command tags"""
+
+    def __init__(self, new_tags_per_chunk: list[int]):
+        self.new_tags_per_chunk = iter(new_tags_per_chunk)
+        self.copy_records_to_table = AsyncMock()
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, statement, *args):
+        if statement == MERGE_BOOKS:
+            return "INSERT 0 2"
+        if statement == MERGE_TAGS:
+            return f"INSERT 0 {next(self.new_tags_per_chunk)}"
+        return "INSERT 0 0"
+
+
+@pytest.mark.asyncio
+async def test_import_bumps_tag_list_version_only_when_tags_are_created(tmp_path):
+    source = tmp_path / "books.ndjson"
+    source.write_text("\n".join(json.dumps({**VALID_ROW, "tags": ["imported"]}) for _ in range(4)) + "\n")
+    importer = BookImporter(source, "ndjson", "feed", None, 2, tmp_path / "state")
+
+    with patch("src.books.importer.tag_list_cache_client.bump", AsyncMock()) as bump:
+        stats = await importer.run(_FakeConnection(new_tags_per_chunk=[1, 0]))
+
+    assert stats.inserted == 4
+    bump.assert_awaited_once()
@@ -1,9 +1,33 @@
+import uuid
+from collections import namedtuple
+
 import pytest
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from src.books.service import BookService
-from src.db.models import Book
+from src.books.service import BookService, BOOK_COLUMNS, MAX_PAGE_SIZE, REVIEW_STATS_COLUMNS, SEARCH_CONFIGS
+from src.db.models import Book, BookReviewStats, Tag
+from src.db.redis import book_cache_client, tag_list_cache_client
 from src.books.schemas import BookCreateModel
+from src.books.utils import decode_cursor, decode_rank_cursor, encode_rank_cursor
+from src.errors import InvalidCursor
+from src.reviews.service import ReviewService
+from src.tags.schemas import TagAddModel, TagCreateModel
+from src.tags.service import TagService
+from src.tests.factories.book_factory import create_fake_book
+
+BOOK_FIELDS = [column.key for column in (*BOOK_COLUMNS, *REVIEW_STATS_COLUMNS)]
+BookRow = namedtuple("BookRow", BOOK_FIELDS)
+RankedBookRow = namedtuple("RankedBookRow", BOOK_FIELDS + ["rank"])
+
+
+def _row(book: Book, rank: float | None = None):
+    """The row a list query returns for a book without review stats"""
+    values = [getattr(book, field, None) for field in BOOK_FIELDS]
+    return BookRow(*values) if rank is None else RankedBookRow(*values, rank)
 
 
 @pytest.mark.asyncio
@@ -21,12 +45,54 @@ async def test_get_all_books():
 
     # The return object from session.exec(...) => has .all()
     exec_result_mock = MagicMock()
-    exec_result_mock.all.return_value = ["b1", "b2", "b3", "b4"]
+    exec_result_mock.all.return_value = [_row(create_fake_book()) for _ in range(4)]
 
     session_mock.exec.return_value = exec_result_mock
 
-    books = await service.get_all_books(session_mock)
-    assert len(books) == 4
+    page = await service.get_all_books(session_mock)
+    assert len(page["items"]) == 4
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_all_books_returns_next_cursor():
+    """
+    The service asks for limit + 1 rows; when the extra row comes back,
+    the page is trimmed to `limit` and next_cursor encodes the last returned book.
+    """
+    service = BookService()
+    session_mock = AsyncMock(spec=AsyncSession)
+
+    books = [
+        Book(
+            title=f"Paged {i}",
+            author="PageAuthor",
+            publisher="PagePub",
+            published_date="2021-01-01",
+            page_count=100,
+            language="EN",
+            created_at=datetime(2024, 1, 10 - i, tzinfo=timezone.utc)
+        )
+        for i in range(3)
+    ]
+    exec_result_mock = MagicMock()
+    exec_result_mock.all.return_value = [_row(book) for book in books]
+    session_mock.exec.return_value = exec_result_mock
+
+    page = await service.get_all_books(session_mock, limit=2)
+    assert [item["uid"] for item in page["items"]] == [book.uid for book in books[:2]]
+    assert page["items"][0]["review_stats"] is None
+    assert decode_cursor(page["next_cursor"]) == (books[1].created_at, books[1].uid)
+
+
+@pytest.mark.asyncio
+async def test_get_all_books_rejects_bad_cursor():
+    service = BookService()
+    session_mock = AsyncMock(spec=AsyncSession)
+
+    with pytest.raises(InvalidCursor):
+        await service.get_all_books(session_mock, cursor="not-a-cursor")
+    session_mock.exec.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -118,3 +184,186 @@ async def test_delete_nonexistent_book():
     session_mock.delete.assert_not_awaited()
     session_mock.commit.assert_not_awaited()
     assert deleted is None
+
+
+@pytest.mark.asyncio
+async def test_export_books_streams_batches_with_details(db_session):
+    """
+    export_books reads through a server-side cursor in batch_size chunks and,
+    with include_details, adds tag names and review aggregates to each row.
+    """
+    service = BookService()
+    books = [create_fake_book() for _ in range(3)]
+    tag = Tag(name="export-tag")
+    books[0].tags.append(tag)
+    books[0].review_stats = BookReviewStats(
+        book_uid=books[0].uid, review_count=2, rating_sum=6, average_rating=3.0, rating_histogram={"2": 1, "4": 1}
+    )
+    db_session.add_all(books)
+    await db_session.commit()
+    exported_uids = {book.uid for book in books}
+
+    batches = [batch async for batch in service.export_books(db_session, include_details=True, batch_size=2)]
+    rows = {row["uid"]: row for batch in batches for row in batch if row["uid"] in exported_uids}
+
+    assert all(len(batch) <= 2 for batch in batches)
+    assert rows[books[0].uid]["tags"] == ["export-tag"]
+    assert rows[books[0].uid]["review_count"] == 2
+    assert rows[books[0].uid]["average_rating"] == 3.0
+    assert rows[books[1].uid]["tags"] == []
+    assert rows[books[1].uid]["average_rating"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_book_detail_json_read_through(db_session, mock_redis):
+    """
+    The first call renders BookDetailModel from the database and stores it with its ETag;
+    the second is served from the cache without touching the session. An entry cached
+    for another ETag is ignored.
+    """
+    service = BookService()
+    book = create_fake_book()
+    db_session.add(book)
+    await db_session.commit()
+
+    payload = await service.get_book_detail_json(book.uid, db_session, '"v1"')
+    assert b'"reviews":[]' in payload
+    assert await mock_redis.get(f"book:detail:{book.uid}") == b'"v1"\n' + payload
+
+    session_mock = AsyncMock(spec=AsyncSession)
+    assert await service.get_book_detail_json(str(book.uid), session_mock, '"v1"') == payload
+    session_mock.exec.assert_not_awaited()
+
+    await mock_redis.set(f"book:detail:{book.uid}", b'"v0"\n{"stale": true}')
+    assert await service.get_book_detail_json(book.uid, db_session, '"v1"') == payload
+
+
+@pytest.mark.asyncio
+async def test_get_book_etag_tracks_book_and_tag_versions(db_session, mock_redis):
+    """The ETag comes from Redis alone and moves with every invalidation and tag list bump"""
+    service = BookService()
+    book = create_fake_book()
+    db_session.add(book)
+    await db_session.commit()
+
+    # No stamp (and so no ETag) until the book is first loaded.
+    assert await service.get_book_etag(book.uid) is None
+    await service.get_book_detail_json(book.uid, db_session)
+    etag = await service.get_book_etag(book.uid)
+    assert etag is not None
+    assert etag == await service.get_book_etag(str(book.uid).upper())
+
+    await ReviewService().update_review_stats(book.uid, 3, 1, db_session)
+    await db_session.commit()
+    await book_cache_client.invalidate(book.uid)
+    after_review = await service.get_book_etag(book.uid)
+    assert after_review != etag
+
+    await TagService().add_tags_to_book(
+        book.uid, TagAddModel(tags=[TagCreateModel(name=f"etag_{uuid.uuid4().hex[:6]}")]), db_session
+    )
+    after_tags = await service.get_book_etag(book.uid)
+    assert after_tags != after_review
+
+    await tag_list_cache_client.bump()
+    assert await service.get_book_etag(book.uid) != after_tags
+
+    mock_redis.get = AsyncMock(side_effect=RedisConnectionError("down"))
+    assert await service.get_book_etag(book.uid) is None
+
+
+@pytest.mark.asyncio
+async def test_create_books_reports_per_item_status(db_session):
+    service = BookService()
+    valid = {
+        "title": "Batch Book",
+        "author": "Batch Author",
+        "publisher": "Batch Pub",
+        "published_date": "2021-01-01",
+        "page_count": 120,
+        "language": "EN",
+    }
+    missing_author = {key: value for key, value in valid.items() if key != "author"}
+
+    report = await service.create_books([valid, missing_author, valid], str(uuid.uuid4()), db_session)
+
+    assert report["created"] == 2
+    assert report["failed"] == 1
+    assert [item["status"] for item in report["items"]] == [201, 422, 201]
+    assert report["items"][1]["errors"][0]["loc"] == ("author",)
+
+    created_uids = [report["items"][0]["uid"], report["items"][2]["uid"]]
+    result = await db_session.exec(select(Book).where(Book.uid.in_(created_uids)))
+    assert {book.title for book in result.all()} == {"Batch Book"}
+
+
+@pytest.mark.asyncio
+async def test_create_books_splits_inserts_at_bind_parameter_limit(db_session, query_counter, monkeypatch):
+    """A batch whose rows exceed the bind parameter limit goes in as several INSERTs, one commit"""
+    monkeypatch.setattr("src.books.service.MAX_BIND_PARAMS", 25)  # two 10-column rows per INSERT
+    items = [{"title": f"Chunked {i}", "author": "A", "publisher": "P", "published_date": "2021-01-01",
+              "page_count": 100, "language": "EN"} for i in range(5)]
+
+    with query_counter.count() as executed:
+        report = await BookService().create_books(items, str(uuid.uuid4()), db_session)
+
+    assert report["created"] == 5
+    assert len([statement for statement in executed if statement.startswith("INSERT INTO books")]) == 3
+    created_uids = [item["uid"] for item in report["items"]]
+    result = await db_session.exec(select(Book).where(Book.uid.in_(created_uids)))
+    assert len(result.all()) == 5
+
+
+@pytest.mark.asyncio
+async def test_get_top_rated_books_orders_by_review_stats(db_session):
+    service = BookService()
+    best, runner_up, unreviewed = create_fake_book(), create_fake_book(), create_fake_book()
+    best.review_stats = BookReviewStats(
+        book_uid=best.uid, review_count=3, rating_sum=12, average_rating=4.0, rating_histogram={"4": 3}
+    )
+    runner_up.review_stats = BookReviewStats(
+        book_uid=runner_up.uid, review_count=1, rating_sum=3, average_rating=3.0, rating_histogram={"3": 1}
+    )
+    db_session.add_all([best, runner_up, unreviewed])
+    await db_session.commit()
+
+    top_rated = await service.get_top_rated_books(db_session, limit=MAX_PAGE_SIZE)
+    ranked = [book["uid"] for book in top_rated]
+
+    assert ranked.index(best.uid) < ranked.index(runner_up.uid)
+    assert unreviewed.uid not in ranked
+    assert top_rated[ranked.index(best.uid)]["review_stats"] == {
+        "review_count": 3, "average_rating": 4.0, "rating_histogram": {"4": 3}
+    }
+
+
+@pytest.mark.asyncio
+async def test_search_books_pages_by_rank():
+    service = BookService()
+    session_mock = AsyncMock(spec=AsyncSession)
+    books = [create_fake_book() for _ in range(3)]
+
+    exec_result_mock = MagicMock()
+    exec_result_mock.all.return_value = [_row(book, rank) for book, rank in zip(books, [0.9, 0.5, 0.1])]
+    session_mock.exec.return_value = exec_result_mock
+
+    page = await service.search_books(session_mock, "hidden path", limit=2)
+    assert [item["uid"] for item in page["items"]] == [book.uid for book in books[:2]]
+    assert "rank" not in page["items"][0]
+    assert decode_rank_cursor(page["next_cursor"]) == (0.5, books[1].uid)
+
+
+def test_build_search_statement_uses_search_vector():
+    """The statement is PostgreSQL-only, so it is checked in its compiled form."""
+    service = BookService()
+    cursor = encode_rank_cursor(0.5, uuid.uuid4())
+
+    dialect = postgresql.dialect()
+    any_language = str(service.build_search_statement("hidden path", cursor=cursor).compile(dialect=dialect))
+    english = str(service.build_search_statement("hidden path", language="English").compile(dialect=dialect))
+
+    assert "books.search_vector @@ search_query.query" in any_language
+    assert any_language.count("websearch_to_tsquery") == len(SEARCH_CONFIGS)
+    assert "(ts_rank(books.search_vector, search_query.query), books.uid) <" in any_language
+    assert "ORDER BY rank DESC, books.uid DESC" in any_language
+    assert "books_search_config(" in english
@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from src.books.utils import encode_cursor, decode_cursor, encode_rank_cursor, decode_rank_cursor
+from src.errors import InvalidCursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 6, 18, 50, 10, 206513, tzinfo=timezone.utc)
+    uid = uuid.uuid4()
+
+    cursor = encode_cursor(created_at, uid)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, uid)
+
+
+@pytest.mark.parametrize("cursor", ["", "garbage", "W10", encode_cursor(datetime.now(timezone.utc), uuid.uuid4())[:-4]])
+def test_decode_cursor_invalid(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_rank_cursor_round_trip():
+    uid = uuid.uuid4()
+
+    assert decode_rank_cursor(encode_rank_cursor(0.0607927, uid)) == (0.0607927, uid)
+
+
+@pytest.mark.parametrize("cursor", ["garbage", encode_cursor(datetime.now(timezone.utc), uuid.uuid4())])
+def test_decode_rank_cursor_invalid(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_rank_cursor(cursor)
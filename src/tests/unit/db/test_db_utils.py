@@ -0,0 +1,22 @@
+# File: src/tests/unit/db/test_db_utils.py
+
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.db.utils import dialect_insert, escape_like
+
+
+def test_escape_like():
+    assert escape_like("100%_sure\\") == "100\\%\\_sure\\\\"
+    assert escape_like("plain") == "plain"
+
+
+def test_dialect_insert_follows_the_bound_database():
+    session = MagicMock()
+
+    session.get_bind.return_value.dialect.name = "sqlite"
+    assert dialect_insert(session) is sqlite.insert
+
+    session.get_bind.return_value.dialect.name = "postgresql"
+    assert dialect_insert(session) is postgresql.insert
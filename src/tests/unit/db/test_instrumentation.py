@@ -0,0 +1,89 @@
+# File: src/tests/unit/db/test_instrumentation.py
+
+import logging
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import Config
+from src.db.instrumentation import (
+    QueryStatsMiddleware,
+    instrument_engine,
+    normalize_sql,
+    stop_tracking_queries,
+    track_queries,
+)
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+    yield engine
+    await engine.dispose()
+
+
+def test_normalize_sql():
+    assert normalize_sql("SELECT *\n  FROM books WHERE title = 'Dune' AND page_count > 100") == \
+           "SELECT * FROM books WHERE title = ? AND page_count > ?"
+    assert normalize_sql("SELECT * FROM tags WHERE uid IN ($1, $2, $3)") == \
+           normalize_sql("SELECT * FROM tags WHERE uid IN ($1, $2)") == \
+           "SELECT * FROM tags WHERE uid IN (...)"
+    assert normalize_sql("INSERT INTO book_tags VALUES (?, ?), (?, ?), (?, ?)") == \
+           "INSERT INTO book_tags VALUES (...)"
+
+
+@pytest.mark.asyncio
+async def test_statements_are_counted_for_the_tracked_context(engine):
+    stats, token = track_queries()
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+    finally:
+        stop_tracking_queries(token)
+
+    assert stats.count == 2
+    assert stats.seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_normalized(engine, monkeypatch, caplog):
+    monkeypatch.setattr(Config, "SLOW_QUERY_MS", 0)
+
+    with caplog.at_level(logging.WARNING, logger="src.db.instrumentation"):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 'secret'"))
+
+    assert "Slow query" in caplog.text
+    assert "SELECT ?" in caplog.text
+    assert "secret" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header_in_debug_mode(engine, monkeypatch):
+    app = FastAPI()
+
+    @app.get("/two-queries")
+    async def two_queries():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+        return {}
+
+    app.add_middleware(QueryStatsMiddleware)  # type: ignore
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        monkeypatch.setattr(Config, "DEBUG", False)
+        assert "server-timing" not in (await client.get("/two-queries")).headers
+
+        monkeypatch.setattr(Config, "DEBUG", True)
+        response = await client.get("/two-queries")
+
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="2 queries"' in response.headers["server-timing"]
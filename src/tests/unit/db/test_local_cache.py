@@ -0,0 +1,29 @@
+from unittest.mock import patch
+
+from src.db.local_cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=5)
+    with patch("src.db.local_cache.time.monotonic", return_value=100.0):
+        cache.set("short", True, ttl=1)
+        cache.set("default", False)
+
+    with patch("src.db.local_cache.time.monotonic", return_value=102.0):
+        assert cache.get("short") is None
+        assert cache.get("default") is False
+
+    with patch("src.db.local_cache.time.monotonic", return_value=105.0):
+        assert cache.get("default", "gone") == "gone"
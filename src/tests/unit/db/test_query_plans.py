@@ -0,0 +1,72 @@
+# File: src/tests/unit/db/test_query_plans.py
+
+import re
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from src.auth.service import UserService
+from src.books.service import BookService
+from src.books.utils import encode_cursor
+from src.reviews.service import ReviewService
+from src.tags.service import TagService
+from src.tests.factories.book_factory import create_fake_book
+from src.tests.factories.review_factory import create_fake_review
+from src.tests.factories.tags_factory import create_fake_tag
+from src.tests.factories.user_factory import create_fake_user
+
+# SQLite reports "SCAN <table>" for a full table scan, "SCAN <table> USING INDEX ..." for an
+# index scan and "USE TEMP B-TREE FOR ORDER BY" when it has to sort rows itself.
+FULL_SCAN = re.compile(r"^SCAN \w+$")
+SORT = "USE TEMP B-TREE"
+
+
+@pytest.fixture
+def captured_selects(test_engine):
+    """Record every SELECT the services send to the database, with its parameters."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(test_engine.sync_engine, "before_cursor_execute", capture)
+
+
+async def explain(test_engine, statement, parameters) -> list[str]:
+    async with test_engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in result.all()]
+
+
+@pytest.mark.asyncio
+async def test_service_lookups_use_indexes(db_session, test_engine, captured_selects):
+    user = create_fake_user(email=f"plan_{uuid.uuid4().hex[:6]}@example.com", is_verified=True)
+    book = create_fake_book(user_uid=user.uid)
+    tag = create_fake_tag()
+    book.tags.append(tag)
+    review = create_fake_review(user_uid=user.uid, book_uid=book.uid)
+    db_session.add_all([user, book, tag, review])
+    await db_session.commit()
+    db_session.expunge_all()
+    captured_selects.clear()
+
+    await UserService().get_user_by_email(user.email, db_session)
+    await UserService().get_principal_by_email(user.email, db_session)
+    await BookService().get_all_books(db_session, limit=10)
+    await BookService().get_all_books(db_session, limit=10, cursor=encode_cursor(book.created_at, book.uid))
+    await BookService().get_user_books(user.uid, db_session)
+    await BookService().get_top_rated_books(db_session, limit=10)
+    await BookService().get_book_by_id(book.uid, db_session)
+    await TagService().get_tag_by_uid(tag.uid, db_session)
+    await ReviewService().get_review(review.uid, db_session)
+    await ReviewService().update_review_stats(book.uid, review.rating, 1, db_session)
+
+    assert captured_selects
+    for statement, parameters in captured_selects:
+        plan = await explain(test_engine, statement, parameters)
+        offending = [step for step in plan if FULL_SCAN.match(step) or SORT in step]
+        assert not offending, f"{offending} in plan {plan} for:\n{statement}"
@@ -1,5 +1,11 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock
+
 import pytest
-from src.db.redis import TokenBlocklistClient
+from prometheus_client import REGISTRY
+from redis.exceptions import ConnectionError as RedisConnectionError
+from src.db.redis import TokenBlocklistClient, BookCacheClient, TagListCacheClient
 
 
 @pytest.mark.asyncio
@@ -45,3 +51,118 @@ async def test_connect_success(mock_redis):
     await client.connect()
     pong = await mock_redis.ping()
     assert pong is True
+    await client.close()
+
+
+def _blocklist_lookups() -> tuple[float, float]:
+    return (REGISTRY.get_sample_value("bookly_token_blocklist_local_hits_total"),
+            REGISTRY.get_sample_value("bookly_token_blocklist_local_misses_total"))
+
+
+@pytest.mark.asyncio
+async def test_token_in_blocklist_uses_local_cache(mock_redis):
+    """Repeated lookups of the same JTI are answered without a Redis round trip"""
+    client = TokenBlocklistClient()
+    client.redis = mock_redis
+    hits, misses = _blocklist_lookups()
+
+    assert await client.token_in_blocklist("hot-jti") is False
+    assert await client.token_in_blocklist("hot-jti") is False
+    assert _blocklist_lookups() == (hits + 1, misses + 1)
+
+
+@pytest.mark.asyncio
+async def test_negative_lookup_expires_after_local_ttl(mock_redis):
+    """Without pub/sub, a revocation is still seen once local_ttl has passed"""
+    client = TokenBlocklistClient(local_ttl=0)
+    client.redis = mock_redis
+
+    assert await client.token_in_blocklist("jti") is False
+    await mock_redis.set("jti", "")
+    assert await client.token_in_blocklist("jti") is True
+
+
+@pytest.mark.asyncio
+async def test_revocation_is_broadcast_to_other_workers(mock_redis):
+    """A JTI revoked on one worker overrides another worker's cached negative lookup"""
+    worker_a = TokenBlocklistClient()
+    worker_b = TokenBlocklistClient()
+    worker_a.redis = worker_b.redis = mock_redis
+    await worker_a.connect()
+    await asyncio.sleep(0)
+    _, misses = _blocklist_lookups()
+
+    assert await worker_a.token_in_blocklist("shared-jti") is False
+    await worker_b.add_jti_to_blocklist("shared-jti")
+    await asyncio.sleep(0)
+
+    assert await worker_a.token_in_blocklist("shared-jti") is True
+    assert _blocklist_lookups()[1] == misses + 1
+    await worker_a.close()
+
+
+def _cache_lookups() -> tuple[float, float]:
+    return (REGISTRY.get_sample_value("bookly_book_cache_hits_total"),
+            REGISTRY.get_sample_value("bookly_book_cache_misses_total"))
+
+
+@pytest.mark.asyncio
+async def test_book_cache_hit_miss_and_invalidate(mock_redis):
+    """Cached payloads are counted as hits, invalidation turns them back into misses"""
+    client = BookCacheClient()
+    client.redis = mock_redis
+    book_uid = uuid.uuid4()
+    hits, misses = _cache_lookups()
+
+    assert await client.get(book_uid) is None
+    await client.set(book_uid, b'{"title": "Cached"}')
+    # Path parameters arrive as strings in any casing; they share the normalized key
+    assert await client.get(str(book_uid).upper()) == b'{"title": "Cached"}'
+
+    await client.invalidate(str(book_uid))
+    assert await client.get(book_uid) is None
+    assert _cache_lookups() == (hits + 1, misses + 2)
+
+
+@pytest.mark.asyncio
+async def test_book_cache_fails_open(mock_redis):
+    """A Redis outage is reported as a miss instead of failing the request"""
+    client = BookCacheClient()
+    client.redis = mock_redis
+    mock_redis.get = AsyncMock(side_effect=RedisConnectionError("down"))
+    hits, misses = _cache_lookups()
+
+    assert await client.get("some-book") is None
+    assert _cache_lookups() == (hits, misses + 1)
+
+
+@pytest.mark.asyncio
+async def test_tag_list_cache_is_keyed_by_version(mock_redis):
+    """A bump invalidates the local copy and moves the shared version stamp forward"""
+    client = TagListCacheClient()
+    client.redis = mock_redis
+    hits = REGISTRY.get_sample_value("bookly_tag_list_cache_hits_total")
+    misses = REGISTRY.get_sample_value("bookly_tag_list_cache_misses_total")
+
+    version = await client.version()
+    assert version is not None
+    assert await client.version() == version
+
+    client.set(version, b"[]")
+    assert client.get(version) == b"[]"
+
+    await client.bump()
+    assert await client.version() == version + 1
+    assert client.get(version) is None
+    assert client.get(version + 1) is None
+    assert REGISTRY.get_sample_value("bookly_tag_list_cache_hits_total") == hits + 1
+    assert REGISTRY.get_sample_value("bookly_tag_list_cache_misses_total") == misses + 2
+
+
+@pytest.mark.asyncio
+async def test_tag_list_version_unavailable_without_redis(mock_redis):
+    client = TagListCacheClient()
+    client.redis = mock_redis
+    mock_redis.get = AsyncMock(side_effect=RedisConnectionError("down"))
+
+    assert await client.version() is None
@@ -1,10 +1,12 @@
 # File: src/tests/unit/reviews/test_reviews_service.py
 
 import pytest
+from collections import namedtuple
 from unittest.mock import AsyncMock, MagicMock, patch
 from sqlmodel.ext.asyncio.session import AsyncSession
-from src.reviews.service import ReviewService
-from src.db.models import Review, Book, User
+from src.reviews.service import REVIEW_COLUMNS, ReviewService
+from src.db.models import Review, Book, BookReviewStats, User
+from src.tests.factories.book_factory import create_fake_book
 from src.reviews.schemas import ReviewCreateModel
 from fastapi import HTTPException, status
 
@@ -23,6 +25,7 @@ async def test_add_review_to_book_success(mock_get_user, mock_get_book):
     session_mock.add = MagicMock()
     session_mock.commit = AsyncMock()
     session_mock.refresh = AsyncMock()
+    service.update_review_stats = AsyncMock()
 
     review_data = ReviewCreateModel(rating=4, review_text="Great read!")
     new_review = await service.add_review_to_book(
@@ -33,6 +36,7 @@ async def test_add_review_to_book_success(mock_get_user, mock_get_book):
     )
     session_mock.add.assert_called_once()
     session_mock.commit.assert_awaited_once()
+    service.update_review_stats.assert_awaited_once_with(dummy_book.uid, 4, 1, session_mock)
     assert new_review.review_text == "Great read!"
     assert new_review.rating == 4
     assert new_review.book == dummy_book
@@ -56,13 +60,17 @@ async def test_get_all_reviews():
     service = ReviewService()
     session_mock = AsyncMock(spec=AsyncSession)
     exec_result = MagicMock()
+    fields = [column.key for column in REVIEW_COLUMNS]
+    ReviewRow = namedtuple("ReviewRow", fields)
     exec_result.all.return_value = [
-        Review(rating=1, review_text="Bad"),
-        Review(rating=4, review_text="Nice")
+        ReviewRow(*(getattr(review, field) for field in fields))
+        for review in (Review(rating=1, review_text="Bad"), Review(rating=4, review_text="Nice"))
     ]
     session_mock.exec.return_value = exec_result
     all_reviews = await service.get_all_reviews(session_mock)
     assert len(all_reviews) == 2
+    assert all_reviews[1]["review_text"] == "Nice"
+    assert set(all_reviews[0]) == set(fields)
 
 
 @pytest.mark.asyncio
@@ -73,8 +81,7 @@ async def test_delete_review_to_from_book_forbidden(mock_get_user):
     user_current = User(email="currentuser@example.com")
     mock_get_user.return_value = user_current
 
-    dummy_review = Review(rating=3, review_text="Ok book")
-    dummy_review.user = User(email="someoneelse@example.com")
+    dummy_review = Review(rating=3, review_text="Ok book", user_uid=User(email="someoneelse@example.com").uid)
 
     exec_result = MagicMock()
     exec_result.first.return_value = dummy_review
@@ -88,3 +95,29 @@ async def test_delete_review_to_from_book_forbidden(mock_get_user):
         )
     assert exc.value.status_code == status.HTTP_403_FORBIDDEN
     assert "Cannot delete this review" in str(exc.value)
+
+
+@pytest.mark.asyncio
+async def test_update_review_stats_tracks_count_average_and_histogram(db_session):
+    service = ReviewService()
+    book = create_fake_book()
+    db_session.add(book)
+    await db_session.commit()
+
+    for rating in (4, 2, 4):
+        await service.update_review_stats(book.uid, rating, 1, db_session)
+    await db_session.commit()
+
+    stats = await db_session.get(BookReviewStats, book.uid)
+    assert (stats.review_count, stats.rating_sum) == (3, 10)
+    assert stats.average_rating == pytest.approx(10 / 3)
+    assert stats.rating_histogram == {"4": 2, "2": 1}
+
+    await service.update_review_stats(book.uid, 2, -1, db_session)
+    await db_session.commit()
+    assert (stats.review_count, stats.average_rating, stats.rating_histogram) == (2, 4.0, {"4": 2})
+
+    for _ in range(2):
+        await service.update_review_stats(book.uid, 4, -1, db_session)
+    await db_session.commit()
+    assert (stats.review_count, stats.average_rating, stats.rating_histogram) == (0, None, {})
@@ -1,12 +1,19 @@
 # File: src/tests/unit/tags/test_tags_service.py
 
+import uuid
+
 import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
 from unittest.mock import AsyncMock, MagicMock, patch
 from sqlmodel.ext.asyncio.session import AsyncSession
+from src.books.service import BOOK_OPTIONS
 from src.tags.service import TagService
-from src.db.models import Tag
+from src.db.models import BookTag, Tag
 from src.tags.schemas import TagCreateModel, TagAddModel
 from src.errors import TagAlreadyExists, TagNotFound, BookNotFound
+from src.tests.factories.book_factory import create_fake_book
 
 
 @pytest.mark.asyncio
@@ -69,6 +76,7 @@ async def test_delete_tag_success():
     mock_tag = Tag(name="Horror")
 
     service.get_tag_by_uid = AsyncMock(return_value=mock_tag)
+    session_mock.exec.return_value = MagicMock(all=MagicMock(return_value=[]))
     session_mock.delete = AsyncMock()
     session_mock.commit = AsyncMock()
 
@@ -90,34 +98,83 @@ async def test_add_tags_to_book_no_book(mock_get_book):
     with pytest.raises(BookNotFound):
         await service.add_tags_to_book("fake-book-uid", tag_data, session_mock)
 
-    mock_get_book.assert_awaited_once_with(book_uid="fake-book-uid", session=session_mock)
+    mock_get_book.assert_awaited_once_with(book_uid="fake-book-uid", session=session_mock, options=BOOK_OPTIONS)
 
 
 @pytest.mark.asyncio
-@patch("src.tags.service.BookService.get_book_by_id", new_callable=AsyncMock)
-async def test_add_tags_to_book_success(mock_get_book):
-    mock_book = MagicMock()
-    mock_book.tags = []
-    mock_get_book.return_value = mock_book
+async def test_add_tags_to_book_success(db_session):
+    suffix = uuid.uuid4().hex[:8]
+    book = create_fake_book()
+    existing = Tag(name=f"existing_{suffix}")
+    db_session.add_all([book, existing])
+    await db_session.commit()
+
+    service = TagService()
+    tag_data = TagAddModel(tags=[
+        TagCreateModel(name=f"existing_{suffix}"),
+        TagCreateModel(name=f"new_{suffix}"),
+        TagCreateModel(name=f"new_{suffix}"),
+    ])
+    book_tags = select(Tag).join(BookTag, BookTag.tag_id == Tag.uid).where(BookTag.book_id == book.uid)
+
+    updated_book = await service.add_tags_to_book(book.uid, tag_data, db_session)
+    tags = (await db_session.exec(book_tags)).all()
+
+    assert updated_book.uid == book.uid
+    assert sorted(tag.name for tag in tags) == [f"existing_{suffix}", f"new_{suffix}"]
+    assert existing.uid in {tag.uid for tag in tags}
+
+    # Attaching the same tags again is a no-op rather than an integrity error.
+    await service.add_tags_to_book(book.uid, tag_data, db_session)
+    assert len((await db_session.exec(book_tags)).all()) == 2
+
+    result = await db_session.exec(select(Tag).where(Tag.name == f"new_{suffix}"))
+    assert len(result.all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_add_tags_to_book_statement_count_is_constant(db_session, test_engine):
+    book = create_fake_book()
+    db_session.add(book)
+    await db_session.commit()
+
+    statements = []
 
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    service = TagService()
+    event.listen(test_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        suffix = uuid.uuid4().hex[:8]
+        await service.add_tags_to_book(
+            book.uid, TagAddModel(tags=[TagCreateModel(name=f"one_{suffix}")]), db_session
+        )
+        single = len(statements)
+
+        statements.clear()
+        many = TagAddModel(tags=[TagCreateModel(name=f"many_{i}_{suffix}") for i in range(50)])
+        await service.add_tags_to_book(book.uid, many, db_session)
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert len(statements) == single
+
+
+@pytest.mark.asyncio
+async def test_suggest_tags_matches_substring_ranked_by_similarity():
     service = TagService()
     session_mock = AsyncMock(spec=AsyncSession)
+    tag_uid = uuid.uuid4()
 
     exec_result = MagicMock()
-    exec_result.one_or_none.return_value = None
+    exec_result.all.return_value = [(tag_uid, "science fiction")]
     session_mock.exec.return_value = exec_result
 
-    session_mock.add = MagicMock()
-    session_mock.commit = AsyncMock()
-    session_mock.refresh = AsyncMock()
-
-    tag_data = TagAddModel(tags=[TagCreateModel(name="Adventure")])
-    updated_book = await service.add_tags_to_book("fake-book-uid", tag_data, session_mock)
-
-    mock_get_book.assert_awaited_once_with(book_uid="fake-book-uid", session=session_mock)
-    session_mock.commit.assert_awaited_once()
-    session_mock.refresh.assert_awaited_once_with(mock_book)
+    suggestions = await service.suggest_tags("sci_fi%", session_mock, limit=5)
 
-    assert updated_book is mock_book
-    assert len(mock_book.tags) == 1
-    assert mock_book.tags[0].name == "Adventure"
+    assert suggestions == [{"uid": tag_uid, "name": "science fiction"}]
+    compiled = session_mock.exec.call_args.args[0].compile(dialect=postgresql.dialect())
+    assert "tags.name ILIKE %(name_1)s ESCAPE" in str(compiled)
+    assert "ORDER BY similarity(tags.name, %(similarity_1)s) DESC" in str(compiled)
+    assert compiled.params["name_1"] == "%sci\\_fi\\%%"
@@ -0,0 +1,40 @@
+# File: src/tests/unit/test_http_cache.py
+
+import pytest
+from fastapi import Request
+
+from src.http_cache import etag_matches, json_response, make_etag, not_modified
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "headers": headers})
+
+
+def test_make_etag_is_strong_and_deterministic():
+    etag = make_etag("tags", 42)
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("tags", 42)
+    assert etag != make_etag("tags", 43)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"other"', False),
+    ('"abc"', True),
+    ('"other", W/"abc"', True),
+    ("*", True),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(_request(header), '"abc"') is expected
+
+
+def test_responses_carry_the_etag():
+    assert not_modified('"abc"').status_code == 304
+    assert not_modified('"abc"').headers["etag"] == '"abc"'
+
+    response = json_response(b"[]", '"abc"')
+    assert response.body == b"[]"
+    assert response.headers["etag"] == '"abc"'
+    assert "etag" not in json_response(b"[]").headers
@@ -0,0 +1,54 @@
+# File: src/tests/unit/test_metrics.py
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+
+from src.metrics import MetricsMiddleware, metrics_router
+
+
+def _app() -> FastAPI:
+    inner = FastAPI()
+
+    @inner.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    inner.include_router(metrics_router)
+    inner.add_middleware(MetricsMiddleware)  # type: ignore
+    return inner
+
+
+def _count(route: str, status: str) -> float:
+    labels = {"method": "GET", "route": route, "status": status}
+    return REGISTRY.get_sample_value("bookly_http_request_duration_seconds_count", labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_by_route_template():
+    before = _count("/items/{item_id}", "200")
+    unmatched_before = _count("unmatched", "404")
+
+    transport = httpx.ASGITransport(app=_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        await client.get("/nowhere")
+
+    assert _count("/items/{item_id}", "200") == before + 2
+    assert _count("unmatched", "404") == unmatched_before + 1
+    assert REGISTRY.get_sample_value("bookly_http_requests_in_progress", {"method": "GET"}) == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_histograms():
+    transport = httpx.ASGITransport(app=_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/items/1")
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'bookly_http_request_duration_seconds_bucket{le="0.005",method="GET",route="/items/{item_id}"' \
+           in response.text
@@ -0,0 +1,109 @@
+# File: src/tests/unit/test_middleware.py
+
+import io
+import json
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from src import middleware
+from src.middleware import AccessLogMiddleware, JsonAccessFormatter, access_logger, start_access_log, stop_access_log
+
+
+class _Collector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def access_records():
+    collector = _Collector()
+    access_logger.addHandler(collector)
+    yield collector.records
+    access_logger.removeHandler(collector)
+
+
+def _app(sample_rate: float) -> FastAPI:
+    inner = FastAPI()
+
+    @inner.get("/ok")
+    async def ok():
+        return PlainTextResponse("ok")
+
+    @inner.get("/boom")
+    async def boom():
+        return PlainTextResponse("boom", status_code=503)
+
+    inner.add_middleware(AccessLogMiddleware, sample_rate=sample_rate)  # type: ignore
+    return inner
+
+
+async def _get(app: FastAPI, path: str) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path)
+
+
+@pytest.mark.asyncio
+async def test_access_log_records_request(access_records):
+    response = await _get(_app(sample_rate=1.0), "/ok")
+
+    assert response.status_code == 200
+    [record] = access_records
+    assert record.msg["method"] == "GET"
+    assert record.msg["path"] == "/ok"
+    assert record.msg["status"] == 200
+    assert record.msg["duration_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_access_log_sampling_keeps_errors(access_records):
+    app = _app(sample_rate=0.0)
+
+    await _get(app, "/ok")
+    await _get(app, "/boom")
+
+    assert [record.msg["status"] for record in access_records] == [503]
+
+
+def test_json_access_formatter():
+    record = logging.LogRecord("bookly.access", logging.INFO, __file__, 0,
+                               {"method": "GET", "path": "/", "status": 200}, None, None)
+
+    entry = json.loads(JsonAccessFormatter().format(record))
+
+    assert entry["method"] == "GET"
+    assert entry["status"] == 200
+    assert "timestamp" in entry
+
+
+@pytest.mark.asyncio
+async def test_access_log_writes_json_lines_until_stopped():
+    stream = io.StringIO()
+    start_access_log(stream)
+    try:
+        await _get(_app(sample_rate=1.0), "/ok")
+    finally:
+        stop_access_log()
+    await _get(_app(sample_rate=1.0), "/ok")
+
+    [line] = stream.getvalue().splitlines()
+    assert json.loads(line)["path"] == "/ok"
+
+
+@pytest.mark.asyncio
+async def test_access_log_runs_only_inside_the_app_lifespan(app_lifespan):
+    """Importing the app starts no listener thread; the lifespan starts and stops it"""
+    assert middleware._access_listener is None
+
+    async with app_lifespan():
+        assert middleware._access_listener is not None
+
+    assert middleware._access_listener is None